@@ -0,0 +1,40 @@
+import asyncio
+import logging
+from typing import Any, Awaitable
+
+from fastapi import HTTPException, Request
+
+logger = logging.getLogger(__name__)
+
+# nginx's non-standard "client closed request" status, only seen in logs
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def run_until_disconnect(
+    request: Request, work: Awaitable[Any], poll_interval: float = 1.0
+) -> Any:
+    """Await work, cancelling it as soon as the client goes away.
+
+    Cancellation propagates into the service call, which kills any running
+    yt-dlp process and abandons pending translation requests.
+    """
+    task = asyncio.ensure_future(work)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                logger.info("Client disconnected, cancelling %s", request.url.path)
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                raise HTTPException(
+                    status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request"
+                )
+    finally:
+        # The handler itself was cancelled (e.g. server shutdown)
+        if not task.done():
+            task.cancel()
@@ -0,0 +1,136 @@
+import re
+from pathlib import Path
+from typing import Optional, Tuple
+
+import anyio
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+class RangeFileResponse(FileResponse):
+    """206 response with bytes start..end (inclusive) of a file"""
+
+    def __init__(self, path: Path, start: int, end: int, size: int, **kwargs):
+        super().__init__(path, status_code=206, **kwargs)
+        self.start = start
+        self.end = end
+        self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+        self.headers["content-length"] = str(end - start + 1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            remaining = self.end - self.start + 1
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": remaining > 0,
+                    }
+                )
+            if remaining > 0:
+                # File shrank since the stat; end the response anyway
+                await send({"type": "http.response.body", "body": b""})
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match comparison (weak, as RFC 9110 requires for it)"""
+    if header.strip() == "*":
+        return True
+    etag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def not_modified(
+    request: Request, response: Response, etag: str
+) -> Optional[Response]:
+    """Tag response with etag; return a 304 if the client already has it"""
+    headers = {"etag": etag, "cache-control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """(start, end) of a single byte range; None to serve the whole file.
+
+    Raises ValueError for a range that lies outside the file.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        # Multiple ranges or other units: the full file is a valid answer
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+async def file_response(
+    request: Request,
+    path: Path,
+    etag: str,
+    media_type: str,
+    filename: Optional[str] = None,
+) -> Response:
+    """Serve a file with a strong ETag, 304 revalidation and byte ranges.
+
+    The file is streamed from disk in chunks; clients revalidate with
+    If-None-Match (no-cache) and resume or page with Range/If-Range.
+    """
+    stat_result = await anyio.to_thread.run_sync(path.stat)
+    size = stat_result.st_size
+    headers = {"etag": etag, "accept-ranges": "bytes", "cache-control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    # A stale If-Range (an older ETag) asks for the whole new file
+    if range_header and request.headers.get("if-range", etag) == etag:
+        try:
+            byte_range = _parse_range(range_header, size)
+        except ValueError:
+            return Response(
+                status_code=416, headers={**headers, "content-range": f"bytes */{size}"}
+            )
+
+    kwargs = dict(
+        headers=headers,
+        media_type=media_type,
+        filename=filename,
+        stat_result=stat_result,
+        content_disposition_type="inline",
+    )
+    if byte_range and byte_range != (0, size - 1):
+        return RangeFileResponse(path, *byte_range, size, **kwargs)
+    return FileResponse(path, **kwargs)
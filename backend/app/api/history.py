@@ -1,31 +1,157 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+import asyncio
+
+from fastapi import APIRouter, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Optional
 from datetime import datetime
 
-from app.models.translation import TranslationHistory
-from app.services.history import HistoryService
+from app.api.files import not_modified
+from app.models.translation import HistoryChanges, HistoryRecord, TranslationHistory
+from app.services.file_handler import FileHandler
+from app.services.history import history_service
+from app.services.history_export import ARCHIVE_EXTENSIONS, HistoryExportService
 from app.config import settings
 
 router = APIRouter()
-history_service = HistoryService()
+export_service = HistoryExportService(history_service, FileHandler())
+
+
+def _list_etag() -> str:
+    # Weak: the body may be compressed; the URL carries the query
+    return f'W/"history-{history_service.revision}"'
 
 
 @router.get("/history", response_model=List[TranslationHistory])
 async def get_translation_history(
+    request: Request,
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
     source_lang: Optional[str] = None,
     target_lang: Optional[str] = None
 ):
+    cached = not_modified(request, response, _list_etag())
+    if cached:
+        return cached
     return history_service.get_all_entries(limit, offset, source_lang, target_lang)
 
 
+@router.get("/history/records", response_model=List[HistoryRecord])
+async def list_history_records(
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    video_id: Optional[str] = None,
+    type: Optional[str] = None,
+):
+    """List source records with a summary of their translations"""
+    cached = not_modified(request, response, _list_etag())
+    if cached:
+        return cached
+    return history_service.list_records(limit, offset, video_id, type)
+
+
+@router.get("/history/records/{record_id}", response_model=HistoryRecord)
+async def get_history_record(record_id: str, request: Request, response: Response):
+    """Get a source record with its text and all translations"""
+    revision = history_service.record_revision(record_id)
+    if not revision:
+        raise HTTPException(status_code=404, detail="Record not found")
+    cached = not_modified(request, response, f'W/"{revision}"')
+    if cached:
+        return cached
+    return history_service.get_record(record_id)
+
+
+@router.get("/history/changes", response_model=HistoryChanges)
+async def get_history_changes(
+    request: Request, response: Response, since: int = Query(..., ge=0)
+):
+    """Entries added, changed or deleted since a revision"""
+    cached = not_modified(request, response, _list_etag())
+    if cached:
+        return cached
+    return history_service.get_changes(since)
+
+
+async def _change_events(since: int) -> AsyncIterator[str]:
+    # StreamingResponse cancels the generator when the client disconnects
+    idle = 0.0
+    while True:
+        if history_service.revision != since:
+            changes = history_service.get_changes(since)
+            since = changes.revision
+            data = changes.model_dump_json()
+            yield f"id: {since}\nevent: changes\ndata: {data}\n\n"
+            idle = 0.0
+        elif idle >= settings.HISTORY_STREAM_KEEPALIVE:
+            yield ": keepalive\n\n"
+            idle = 0.0
+        await asyncio.sleep(settings.HISTORY_STREAM_INTERVAL)
+        idle += settings.HISTORY_STREAM_INTERVAL
+
+
+@router.get("/history/stream")
+async def stream_history_changes(
+    request: Request, since: Optional[int] = Query(None, ge=0)
+):
+    """Server-sent "changes" events carrying the delta since the last one.
+
+    Starts from since (default: now); each event id is the new revision,
+    so a reconnecting EventSource resumes from its Last-Event-ID.
+    """
+    last_event_id = request.headers.get("last-event-id", "")
+    if last_event_id.isdigit():
+        since = int(last_event_id)
+    elif since is None:
+        since = history_service.revision
+
+    return StreamingResponse(
+        _change_events(since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/history/export")
+async def export_history(format: str = Query("ndjson")):
+    """Download all records with their texts as NDJSON or a zip of files"""
+    if format != "ndjson" and format not in ARCHIVE_EXTENSIONS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    if format == "ndjson":
+        content, media_type = export_service.iter_ndjson(), "application/x-ndjson"
+        file_name = f"ytt-history-{stamp}.ndjson"
+    else:
+        content, media_type = export_service.iter_archive(format), "application/zip"
+        file_name = f"ytt-history-{stamp}-{format}.zip"
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"'},
+    )
+
+
+@router.post("/history/import")
+async def import_history(file: UploadFile = File(...)):
+    """Add the records of an NDJSON export, skipping ones already present"""
+    return await export_service.import_ndjson(file)
+
+
 @router.get("/history/{translation_id}", response_model=TranslationHistory)
-async def get_translation_by_id(translation_id: str):
-    entry = history_service.get_entry_by_id(translation_id)
-    if not entry:
+async def get_translation_by_id(
+    translation_id: str, request: Request, response: Response
+):
+    revision = history_service.entry_revision(translation_id)
+    if not revision:
         raise HTTPException(status_code=404, detail="Translation not found")
-    return entry
+    cached = not_modified(request, response, f'W/"{revision}"')
+    if cached:
+        return cached
+    return history_service.get_entry_by_id(translation_id)
 
 
 @router.delete("/history/{translation_id}")
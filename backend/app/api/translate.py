@@ -1,8 +1,12 @@
+import asyncio
 import logging
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from typing import Optional
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+from pathlib import Path
+from typing import Optional, Tuple
 import time
 
+from app.api.disconnect import run_until_disconnect
 from app.models.translation import (
     TranslationRequest,
     TranslationResponse,
@@ -10,8 +14,10 @@ from app.models.translation import (
     LanguageDetectionResponse,
 )
 from app.services.translator import TranslationService
-from app.services.file_handler import FileHandler
-from app.services.history import HistoryService
+from app.services.documents import DocumentTranslationService
+from app.services.subtitles import Cue, cues_to_text, dump_subtitles
+from app.services.file_handler import FileHandler, FileTooLargeError
+from app.services.history import history_service
 from app.services.youtube import YouTubeTranscriptService
 from app.config import settings
 
@@ -20,12 +26,35 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 translator = TranslationService()
 file_handler = FileHandler()
-history_service = HistoryService()
 youtube_service = YouTubeTranscriptService()
+document_service = DocumentTranslationService(translator, history_service)
+
+
+def _check_upload_size(file: UploadFile):
+    # Checked again while reading, for uploads without a known size
+    if file.size and file.size > settings.MAX_FILE_SIZE_MB * 1024 * 1024:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File size exceeds {settings.MAX_FILE_SIZE_MB}MB limit",
+        )
+
+
+async def _extract_upload(file: UploadFile) -> Tuple[str, str]:
+    _check_upload_size(file)
+
+    try:
+        return await file_handler.extract_text(file)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except asyncio.TimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
 
 
 @router.post("/translate", response_model=TranslationResponse)
 async def translate_text(
+    request: Request,
     text: Optional[str] = Form(None),
     file: Optional[UploadFile] = File(None),
     source_lang: str = Form("auto"),
@@ -41,18 +70,13 @@ async def translate_text(
         )
 
     if file:
-        if file.size > settings.MAX_FILE_SIZE_MB * 1024 * 1024:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File size exceeds {settings.MAX_FILE_SIZE_MB}MB limit",
-            )
-
-        text, file_format = await file_handler.extract_text(file)
+        text, file_format = await _extract_upload(file)
 
     if len(text) > settings.MAX_TEXT_LENGTH:
         raise HTTPException(
             status_code=413,
-            detail=f"Text length exceeds {settings.MAX_TEXT_LENGTH} characters",
+            detail=f"Text length exceeds {settings.MAX_TEXT_LENGTH} characters; "
+            "use /api/translate/documents for longer texts",
         )
 
     logger.info(
@@ -66,11 +90,17 @@ async def translate_text(
     processed_text = translator.prepare_text_for_translation(text)
 
     try:
-        result = await translator.translate(
-            text=processed_text,
-            source_lang=source_lang,
-            target_lang=target_lang,
-            provider=provider,
+        result = await run_until_disconnect(
+            request,
+            asyncio.wait_for(
+                translator.translate(
+                    text=processed_text,
+                    source_lang=source_lang,
+                    target_lang=target_lang,
+                    provider=provider,
+                ),
+                settings.TRANSLATION_TIMEOUT,
+            ),
         )
 
         processing_time = time.time() - start_time
@@ -96,7 +126,10 @@ async def translate_text(
             existing_entry = history_service.get_entry_by_id(entry_id)
             if existing_entry and existing_entry.video_id:
                 youtube_service.save_translation_to_folder(
-                    existing_entry.video_id, target_lang, result["translatedText"]
+                    existing_entry.video_id,
+                    existing_entry.source_lang,
+                    target_lang,
+                    result["translatedText"],
                 )
         else:
             # Create new translation entry (standalone text/file translation)
@@ -113,11 +146,157 @@ async def translate_text(
             )
 
         return response
+    except HTTPException:
+        raise
+    except asyncio.TimeoutError:
+        logger.error("Translation timed out after %ss", settings.TRANSLATION_TIMEOUT)
+        raise HTTPException(
+            status_code=504,
+            detail=f"Translation timed out after {settings.TRANSLATION_TIMEOUT}s",
+        )
     except Exception as e:
         logger.error("Translation failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+SUBTITLE_MEDIA_TYPES = {"srt": "application/x-subrip", "vtt": "text/vtt"}
+
+
+@router.post("/translate/subtitles")
+async def translate_subtitles(
+    request: Request,
+    file: UploadFile = File(...),
+    source_lang: str = Form("auto"),
+    target_lang: str = Form("en"),
+    provider: str = Form("libretranslate"),
+    output_format: Optional[str] = Form(None),
+):
+    """Translate an SRT/VTT file cue by cue and return it with its timings"""
+    fmt = output_format or Path(file.filename).suffix.lower().lstrip(".")
+    if fmt not in SUBTITLE_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400, detail=f"Unsupported subtitle format: {fmt}"
+        )
+
+    _check_upload_size(file)
+    try:
+        cues = await file_handler.extract_cues(file)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Lines of a cue are broken for display only; translate them as one
+    texts = [" ".join(cue.text.split("\n")) for cue in cues]
+
+    try:
+        translated = await run_until_disconnect(
+            request,
+            asyncio.wait_for(
+                translator.translate_batch(texts, source_lang, target_lang, provider),
+                settings.TRANSLATION_TIMEOUT,
+            ),
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail=f"Translation timed out after {settings.TRANSLATION_TIMEOUT}s",
+        )
+    except Exception as e:
+        logger.error("Subtitle translation failed: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    translated_cues = [
+        Cue(cue.start, cue.end, text) for cue, text in zip(cues, translated)
+    ]
+    history_service.add_translation_entry(
+        original_text=cues_to_text(cues),
+        translated_text=cues_to_text(translated_cues),
+        source_lang=source_lang,
+        target_lang=target_lang,
+        provider=provider,
+        title=f"File: {file.filename}",
+    )
+
+    file_name = f"{Path(file.filename).stem}.{target_lang}.{fmt}"
+    return Response(
+        dump_subtitles(translated_cues, fmt),
+        media_type=SUBTITLE_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"'},
+    )
+
+
+@router.post("/translate/documents", status_code=202)
+async def start_document_translation(
+    text: Optional[str] = Form(None),
+    file: Optional[UploadFile] = File(None),
+    source_lang: str = Form("auto"),
+    target_lang: str = Form("en"),
+    provider: str = Form("libretranslate"),
+):
+    """Translate a long text or document in the background and return its job"""
+    if not text and not file:
+        raise HTTPException(
+            status_code=400, detail="Either text or file must be provided"
+        )
+
+    file_format = None
+    if file:
+        text, file_format = await _extract_upload(file)
+
+    if len(text) > settings.MAX_DOCUMENT_LENGTH:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Text length exceeds {settings.MAX_DOCUMENT_LENGTH} characters",
+        )
+
+    file_name = file.filename if file else None
+    return await document_service.start_job(
+        text,
+        source_lang=source_lang,
+        target_lang=target_lang,
+        provider=provider,
+        title=f"File: {file_name}" if file_name else None,
+        file_name=file_name,
+        file_type=file_format,
+    )
+
+
+@router.get("/translate/documents")
+async def list_document_translations():
+    return document_service.list_jobs()
+
+
+@router.get("/translate/documents/{job_id}")
+async def get_document_translation(job_id: str):
+    """Progress of a document translation"""
+    job = document_service.get_progress(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Document job not found")
+    return job
+
+
+@router.get("/translate/documents/{job_id}/result")
+async def get_document_translation_result(job_id: str):
+    """The translated text so far (complete once the job has completed)"""
+    path = document_service.result_path(job_id)
+    if not path:
+        raise HTTPException(status_code=404, detail="No translation available yet")
+    return FileResponse(path, media_type="text/plain; charset=utf-8")
+
+
+@router.delete("/translate/documents/{job_id}")
+async def cancel_document_translation(job_id: str):
+    job = await document_service.cancel_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Document job not found")
+    return job
+
+
 @router.post("/translate/detect", response_model=LanguageDetectionResponse)
 async def detect_language(text: str = Form(...)):
     try:
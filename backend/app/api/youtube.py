@@ -1,11 +1,17 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import List, Optional
 from pydantic import BaseModel
 
+from app.api.disconnect import run_until_disconnect
+from app.api.files import file_response
+from app.services.batch import BatchIngestionService
 from app.services.youtube import YouTubeTranscriptService
 
 router = APIRouter()
 youtube_service = YouTubeTranscriptService()
+batch_service = BatchIngestionService(youtube_service)
 
 
 class YouTubeTranscriptRequest(BaseModel):
@@ -14,6 +20,16 @@ class YouTubeTranscriptRequest(BaseModel):
     target_lang: Optional[str] = None
     use_cookies: str = "none"  # none, firefox, chrome
     merge_lines: bool = True  # Whether to merge subtitle lines into paragraphs
+    # Extra source languages to download and cache in the same run
+    # (None = server default from SUBTITLE_PREFETCH_LANGS)
+    prefetch_langs: Optional[List[str]] = None
+    prefetch_all_manual: Optional[bool] = None  # Also fetch every manual track
+    # Use YouTube's translated captions when available, LibreTranslate otherwise
+    # (None = server default from PREFER_YOUTUBE_TRANSLATION)
+    prefer_youtube_translation: Optional[bool] = None
+    # Response keys to return, e.g. ["title", "target_transcript_processed"]
+    # (None = all of FETCH_RESPONSE_FIELDS)
+    fields: Optional[List[str]] = None
 
     class Config:
         json_schema_extra = {
@@ -23,64 +39,141 @@ class YouTubeTranscriptRequest(BaseModel):
                 "target_lang": "de",
                 "use_cookies": "firefox",
                 "merge_lines": True,
+                "fields": ["video_id", "title", "target_transcript_processed"],
             }
         }
 
 
+FETCH_RESPONSE_FIELDS = (
+    "video_id",
+    "title",
+    "url",
+    "video_info",
+    "available_languages",
+    "source_lang",
+    "source_transcript_raw",
+    "source_transcript_processed",
+    "target_lang",
+    "target_transcript_raw",
+    "target_transcript_processed",
+    "entry_id",
+    "cached",
+    "translation_error",
+    "translation_provider",
+)
+
+
 class YouTubeInfoRequest(BaseModel):
     url: str
     use_cookies: str = "none"
 
 
+class YouTubeBatchRequest(BaseModel):
+    url: str  # Playlist or channel URL
+    source_lang: str = "en"
+    target_lang: Optional[str] = None
+    use_cookies: str = "none"
+    max_videos: Optional[int] = None  # Capped by BATCH_MAX_VIDEOS
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "url": "https://www.youtube.com/playlist?list=PLxxxxxxxxxxxxxxxx",
+                "source_lang": "en",
+                "target_lang": "de",
+                "max_videos": 50,
+            }
+        }
+
+
 @router.post("/youtube/fetch")
-async def fetch_youtube_transcript(request: YouTubeTranscriptRequest):
+async def fetch_youtube_transcript(
+    request: YouTubeTranscriptRequest, http_request: Request
+):
     """Fetch transcript from YouTube video"""
+    unknown = set(request.fields or ()) - set(FETCH_RESPONSE_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+
     try:
-        result = await youtube_service.fetch_and_save_transcript(
-            url=request.url,
-            source_lang=request.source_lang,
-            target_lang=request.target_lang,
-            use_cookies=request.use_cookies,
-            merge_lines=request.merge_lines,
+        result = await run_until_disconnect(
+            http_request,
+            youtube_service.fetch_and_save_transcript(
+                url=request.url,
+                source_lang=request.source_lang,
+                target_lang=request.target_lang,
+                use_cookies=request.use_cookies,
+                merge_lines=request.merge_lines,
+                prefetch_langs=request.prefetch_langs,
+                prefetch_all_manual=request.prefetch_all_manual,
+                prefer_youtube_translation=request.prefer_youtube_translation,
+            ),
         )
 
-        # Return both raw and processed transcripts
-        response = {
-            "video_id": result["video_id"],
-            "title": result["title"],
-            "url": result["url"],
-            "video_info": result["video_info"],
-            "available_languages": result["available_languages"],
-            "source_lang": result["source_lang"],
-            "source_transcript_raw": result["source_transcript_raw"],
-            "source_transcript_processed": result["source_transcript_processed"],
-            "target_lang": result["target_lang"],
-            "target_transcript_raw": result["target_transcript_raw"],
-            "target_transcript_processed": result["target_transcript_processed"],
-            "entry_id": result.get("entry_id"),
-            "cached": result.get("cached", False),
-            "translation_error": result.get("translation_error"),
+        # Both raw and processed transcripts unless the client narrowed fields
+        result.setdefault("cached", False)
+        return {
+            field: result.get(field)
+            for field in request.fields or FETCH_RESPONSE_FIELDS
         }
-
-        return response
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except asyncio.TimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error fetching transcript: {str(e)}"
         )
 
 
+async def _stored_file_response(
+    request: Request, video_id: str, lang: str, translation: bool
+):
+    try:
+        found = await youtube_service.stored_file(video_id, lang, translation)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not found:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    path, digest = found
+    return await file_response(
+        request,
+        path,
+        etag=f'"{digest}"',
+        media_type="text/plain; charset=utf-8",
+        filename=f"{video_id}_{path.name}",
+    )
+
+
+@router.api_route("/youtube/{video_id}/transcript/{lang}", methods=["GET", "HEAD"])
+async def download_transcript(video_id: str, lang: str, request: Request):
+    """transcript_{lang}.txt of a video, with ETag revalidation and Range"""
+    return await _stored_file_response(request, video_id, lang, translation=False)
+
+
+@router.api_route("/youtube/{video_id}/translation/{lang}", methods=["GET", "HEAD"])
+async def download_translation(video_id: str, lang: str, request: Request):
+    """translation_{lang}.txt of a video, with ETag revalidation and Range"""
+    return await _stored_file_response(request, video_id, lang, translation=True)
+
+
 @router.post("/youtube/info")
-async def get_youtube_video_info(request: YouTubeInfoRequest):
+async def get_youtube_video_info(request: YouTubeInfoRequest, http_request: Request):
     """Get YouTube video information and available subtitles"""
     video_id = youtube_service.extract_video_id(request.url)
     if not video_id:
         raise HTTPException(status_code=400, detail="Invalid YouTube URL")
 
     try:
-        video_info = await youtube_service.get_video_info(
-            request.url, request.use_cookies
+        # Both read the same cached metadata, so only the first call runs yt-dlp
+        video_info = await run_until_disconnect(
+            http_request,
+            youtube_service.get_video_info(request.url, request.use_cookies),
         )
         available_subs = await youtube_service.check_available_subtitles(
             request.url, request.use_cookies
@@ -91,12 +184,50 @@ async def get_youtube_video_info(request: YouTubeInfoRequest):
             "video_info": video_info,
             "available_subtitles": available_subs,
         }
+    except HTTPException:
+        raise
+    except asyncio.TimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error getting video info: {str(e)}"
         )
 
 
+@router.post("/youtube/batch")
+async def start_batch_ingestion(request: YouTubeBatchRequest):
+    """Ingest and translate every video of a playlist or channel in the background"""
+    try:
+        return await batch_service.start_job(
+            url=request.url,
+            source_lang=request.source_lang,
+            target_lang=request.target_lang,
+            use_cookies=request.use_cookies,
+            max_videos=request.max_videos,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error starting batch ingestion: {str(e)}"
+        )
+
+
+@router.get("/youtube/batch")
+async def list_batch_jobs():
+    """List batch ingestion jobs with aggregate progress"""
+    return batch_service.list_jobs()
+
+
+@router.get("/youtube/batch/{job_id}")
+async def get_batch_job(job_id: str):
+    """Get per-video and aggregate progress of a batch ingestion job"""
+    job = batch_service.get_progress(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return job
+
+
 @router.get("/youtube/extract-id")
 async def extract_video_id(url: str = Query(..., description="YouTube URL")):
     """Extract video ID from YouTube URL"""
@@ -19,11 +19,17 @@ class Settings(BaseSettings):
     
     REDIS_URL: str = ""
     CACHE_TTL: int = 3600
+    # Seconds a missing (video, subtitle language) combination is remembered
+    NEGATIVE_CACHE_TTL: int = 300
     
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     MAX_FILE_SIZE_MB: int = 10
     RATE_LIMIT: str = "100/minute"
     
+    # JSON/text responses from this size up are compressed (gzip, or brotli
+    # when the brotli package is installed)
+    COMPRESSION_MIN_SIZE: int = 1024
+    
     CORS_ORIGINS: List[str] = [
         "http://localhost:5173",  # Development frontend
         "http://localhost:8000",  # Production same-origin
@@ -39,9 +45,60 @@ class Settings(BaseSettings):
     CHUNK_SIZE: int = 5000
     MAX_TEXT_LENGTH: int = 50000
     
+    # Paragraph segmentation of transcripts (keep MAX below CHUNK_SIZE)
+    PARAGRAPH_MIN_CHARS: int = 200
+    PARAGRAPH_MAX_CHARS: int = 1000
+    PARAGRAPH_PAUSE_SECONDS: float = 1.5
+    
+    # Extra subtitle languages downloaded in the same yt-dlp run as the source
+    SUBTITLE_PREFETCH_LANGS: List[str] = []
+    SUBTITLE_PREFETCH_ALL_MANUAL: bool = False
+    # Try YouTube's own (auto-)translated captions before LibreTranslate
+    PREFER_YOUTUBE_TRANSLATION: bool = False
+    
+    # Deadlines in seconds: per yt-dlp run, and for a whole translation
+    YTDLP_TIMEOUT: int = 120
+    TRANSLATION_TIMEOUT: int = 600
+    
+    # Seconds before browser cookies are exported again (data/cookies/)
+    COOKIE_TTL: int = 3600
+    
+    # PDF/DOCX extraction process pool (0 workers = one per CPU)
+    EXTRACTION_WORKERS: int = 0
+    EXTRACTION_TIMEOUT: int = 120
+    PDF_PAGES_PER_TASK: int = 8
+    
+    # Uploads are read in chunks; text encoding is detected from a prefix
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    ENCODING_SNIFF_BYTES: int = 64 * 1024
+    
+    # Background translation of documents beyond MAX_TEXT_LENGTH
+    # (/translate/documents), written to DATA_DIR/documents/<job id>/
+    MAX_DOCUMENT_LENGTH: int = 5000000
+    
+    # Records added per history.json write when importing an export
+    HISTORY_IMPORT_BATCH: int = 500
+    
+    # Writes logged in history.json for /history/changes; clients further
+    # behind reload the list. /history/stream checks for changes every
+    # interval and sends a keepalive comment when idle that long
+    HISTORY_CHANGE_LOG_SIZE: int = 1000
+    HISTORY_STREAM_INTERVAL: float = 1.0
+    HISTORY_STREAM_KEEPALIVE: float = 15.0
+    
+    # Playlist/channel ingestion
+    BATCH_CONCURRENCY: int = 2
+    BATCH_MAX_VIDEOS: int = 200
+    
     DATA_DIR: Path = Path("./data")
     UPLOAD_DIR: Path = Path("./data/uploads")
     TRANSCRIPT_DIR: Path = Path("./data/transcripts")
+    # Transcript texts are stored once under DATA_DIR/blobs: none, gzip or zstd
+    # (zstd needs the zstandard package). Deleting history removes blobs
+    # nothing references any more, unless stored or reused within the grace
+    # seconds
+    BLOB_COMPRESSION: str = "none"
+    BLOB_GC_GRACE: int = 3600
     
     class Config:
         env_file = ".env"
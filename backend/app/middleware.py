@@ -0,0 +1,127 @@
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Already compressed (zip exports) or streamed live (event streams) responses
+# are passed through, as are files served with byte ranges, whose offsets
+# and ETags refer to the uncompressed bytes
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=5)
+        else:
+            self._brotli = None
+            # wbits 16+ writes a gzip header and trailer
+            self._zlib = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self._brotli:
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def finish(self) -> bytes:
+        if self._brotli:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """gzip or brotli (if installed) for JSON and text responses.
+
+    Bodies sent in one piece are compressed only from minimum_size bytes
+    up; streamed bodies are compressed chunk by chunk as they pass.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    def _encoding(self, scope: Scope) -> Optional[str]:
+        accepted = {
+            part.split(";")[0].strip().lower()
+            for part in Headers(scope=scope).get("accept-encoding", "").split(",")
+        }
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        encoding = self._encoding(scope) if scope["type"] == "http" else None
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def wrapped_send(message: Message):
+            nonlocal start, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                passthrough = (
+                    "content-encoding" in headers
+                    or "accept-ranges" in headers
+                    or "content-range" in headers
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                    or content_type.startswith(EXCLUDED_TYPES)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    # Held back until the first body chunk shows the size
+                    start = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    await send(start)
+                    await send(message)
+                    passthrough = True
+                    return
+
+                compressor = _Compressor(encoding)
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                if not more_body:
+                    data = compressor.compress(body) + compressor.finish()
+                    headers["Content-Length"] = str(len(data))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": data})
+                    return
+                await send(start)
+
+            data = compressor.compress(body)
+            if not more_body:
+                data += compressor.finish()
+            if data or not more_body:
+                await send(
+                    {"type": "http.response.body", "body": data, "more_body": more_body}
+                )
+
+        await self.app(scope, receive, wrapped_send)
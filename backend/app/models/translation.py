@@ -110,7 +110,47 @@ class TranslationHistory(BaseModel):
     video_info: Optional[dict] = None
     type: Optional[str] = None  # "text", "youtube", "file"
     updated_at: Optional[datetime] = None
-    folder_path: Optional[str] = None
+    folder_path: Optional[str] = None  # Entry folder: video id or document job id
+    record_id: Optional[str] = None  # Source record shared by all translations
 
     class Config:
         from_attributes = True
+
+
+class HistoryTranslation(BaseModel):
+    id: str
+    target_lang: str
+    provider: str
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    translated_text_hash: Optional[str] = None
+    translated_text: Optional[str] = None  # Only in record details
+
+
+class HistoryRecord(BaseModel):
+    """A source transcript or text with all of its translations"""
+
+    id: str
+    type: Optional[str] = None  # "text", "youtube", "file"
+    title: Optional[str] = None
+    source_lang: str
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    video_id: Optional[str] = None
+    youtube_url: Optional[str] = None
+    available_languages: Optional[List[str]] = None
+    video_info: Optional[dict] = None
+    folder_path: Optional[str] = None
+    file_name: Optional[str] = None
+    file_type: Optional[str] = None
+    original_text_hash: Optional[str] = None
+    original_text: Optional[str] = None  # Only in record details
+    translations: List[HistoryTranslation] = []
+
+
+class HistoryChanges(BaseModel):
+    """Delta between a client's history revision and the current one"""
+    revision: int
+    reset: bool = False  # Log does not reach back that far: reload the list
+    entries: List[TranslationHistory] = []  # Added or changed, newest first
+    deleted: List[str] = []  # Entry ids removed since
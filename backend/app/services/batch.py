@@ -0,0 +1,176 @@
+import asyncio
+import json
+import logging
+import re
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.services.youtube import YouTubeTranscriptService
+
+logger = logging.getLogger(__name__)
+
+# Bare channel URLs list tabs (Videos, Shorts, Live) rather than videos
+CHANNEL_URL_RE = re.compile(
+    r"youtube\.com/(@[^/?#]+|channel/[^/?#]+|c/[^/?#]+|user/[^/?#]+)/?$"
+)
+
+
+class BatchIngestionService:
+    """Ingest every video of a playlist or channel with bounded concurrency"""
+
+    def __init__(self, youtube_service: YouTubeTranscriptService):
+        self.youtube_service = youtube_service
+        self.history_service = youtube_service.history_service
+        self.jobs: Dict[str, Dict] = {}
+        self._tasks = set()
+        self._semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+
+    async def expand_playlist(
+        self, url: str, use_cookies: str = "none", max_videos: Optional[int] = None
+    ) -> Dict:
+        """List the videos of a playlist or channel with one flat extraction"""
+        if CHANNEL_URL_RE.search(url):
+            url = url.rstrip("/") + "/videos"
+
+        limit = min(max_videos or settings.BATCH_MAX_VIDEOS, settings.BATCH_MAX_VIDEOS)
+        cmd = [
+            "yt-dlp",
+            "--flat-playlist",
+            "--dump-single-json",
+            "--yes-playlist",
+            "--playlist-end",
+            str(limit),
+            "--no-warnings",
+            url,
+        ]
+
+        returncode, stdout, stderr = await self.youtube_service.run_ytdlp(
+            cmd, use_cookies
+        )
+
+        if returncode != 0 or not stdout:
+            raise ValueError(
+                f"Could not expand playlist: {stderr.decode().strip()[:200]}"
+            )
+
+        data = json.loads(stdout.decode())
+        videos = []
+        for entry in data.get("entries") or []:
+            video_id = entry.get("id")
+            if not video_id or entry.get("_type") == "playlist":
+                continue
+            videos.append(
+                {
+                    "video_id": video_id,
+                    "title": entry.get("title") or video_id,
+                    "url": f"https://www.youtube.com/watch?v={video_id}",
+                }
+            )
+
+        return {"title": data.get("title", ""), "videos": videos[:limit]}
+
+    async def start_job(
+        self,
+        url: str,
+        source_lang: str = "en",
+        target_lang: Optional[str] = None,
+        use_cookies: str = "none",
+        max_videos: Optional[int] = None,
+    ) -> Dict:
+        """Expand the playlist and schedule fetch+translate work in the background"""
+        playlist = await self.expand_playlist(url, use_cookies, max_videos)
+
+        job_id = str(uuid.uuid4())
+        items = []
+        for video in playlist["videos"]:
+            existing = self.history_service.find_youtube_entry(
+                video["video_id"], source_lang, target_lang
+            )
+            items.append(
+                {
+                    **video,
+                    "status": "skipped" if existing else "pending",
+                    "entry_id": existing["id"] if existing else None,
+                    "error": None,
+                }
+            )
+
+        job = {
+            "id": job_id,
+            "url": url,
+            "title": playlist["title"],
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            "status": "running",
+            "created_at": datetime.now().isoformat(),
+            "finished_at": None,
+            "items": items,
+        }
+        self.jobs[job_id] = job
+        logger.info(
+            "Batch %s: %d videos from %s (%d already in history)",
+            job_id,
+            len(items),
+            url,
+            sum(1 for item in items if item["status"] == "skipped"),
+        )
+
+        task = asyncio.create_task(self._run_job(job, use_cookies))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        return self.get_progress(job_id)
+
+    async def _run_job(self, job: Dict, use_cookies: str):
+        pending = [item for item in job["items"] if item["status"] == "pending"]
+        await asyncio.gather(
+            *(self._ingest_video(job, item, use_cookies) for item in pending)
+        )
+        job["status"] = "completed"
+        job["finished_at"] = datetime.now().isoformat()
+        logger.info("Batch %s finished", job["id"])
+
+    async def _ingest_video(self, job: Dict, item: Dict, use_cookies: str):
+        async with self._semaphore:
+            item["status"] = "running"
+            try:
+                result = await self.youtube_service.fetch_and_save_transcript(
+                    url=item["url"],
+                    source_lang=job["source_lang"],
+                    target_lang=job["target_lang"],
+                    use_cookies=use_cookies,
+                )
+                item["entry_id"] = result["entry_id"]
+                item["error"] = result.get("translation_error")
+                item["status"] = "failed" if item["error"] else "done"
+            except Exception as e:
+                logger.warning("Batch %s: %s failed: %s", job["id"], item["video_id"], e)
+                item["status"] = "failed"
+                item["error"] = str(e)
+
+    def get_progress(self, job_id: str) -> Optional[Dict]:
+        """Return a job with aggregate counts per status"""
+        job = self.jobs.get(job_id)
+        if not job:
+            return None
+
+        counts = {"pending": 0, "running": 0, "done": 0, "failed": 0, "skipped": 0}
+        for item in job["items"]:
+            counts[item["status"]] += 1
+        total = len(job["items"])
+        finished = counts["done"] + counts["failed"] + counts["skipped"]
+
+        return {
+            **job,
+            "total": total,
+            "counts": counts,
+            "progress": finished / total if total else 1.0,
+        }
+
+    def list_jobs(self) -> List[Dict]:
+        return [
+            {k: v for k, v in self.get_progress(job_id).items() if k != "items"}
+            for job_id in reversed(list(self.jobs))
+        ]
@@ -0,0 +1,144 @@
+import gzip
+import hashlib
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Optional, Set
+
+from app.config import settings
+from app.services.persistence import writer
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# File suffix per compression; lookups try all of them, so changing
+# BLOB_COMPRESSION keeps older blobs readable
+SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+class BlobStore:
+    """Content-addressed text store under DATA_DIR/blobs.
+
+    Texts are keyed by their SHA-256, so a transcript referenced by several
+    history entries and meta.json files is stored once. Storing a text that
+    is already present refreshes the blob's mtime, which sweep uses to
+    spare blobs that may be about to be referenced.
+    """
+
+    def __init__(self, blob_dir: Optional[Path] = None, compression: Optional[str] = None):
+        self.blob_dir = blob_dir or settings.DATA_DIR / "blobs"
+        compression = compression or settings.BLOB_COMPRESSION
+        if compression not in SUFFIXES:
+            raise ValueError(f"Unsupported blob compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed, compressing blobs with gzip")
+            compression = "gzip"
+        self.compression = compression
+
+    def _path(self, digest: str, compression: str) -> Path:
+        return self.blob_dir / digest[:2] / f"{digest}{SUFFIXES[compression]}"
+
+    def path(self, digest: str) -> Path:
+        """Path of the blob in the current compression"""
+        return self._path(digest, self.compression)
+
+    def _reuse(self, path: Path) -> bool:
+        """Whether the blob at path exists; refreshes its mtime if so"""
+        if not writer.exists(path):
+            return False
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # still queued
+        return True
+
+    def put(self, text: str) -> str:
+        """Store text (written in the background) and return its hash"""
+        data = text.encode()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if self._reuse(path):
+            return digest
+
+        if self.compression == "gzip":
+            data = gzip.compress(data, mtime=0)
+        elif self.compression == "zstd":
+            data = zstandard.ZstdCompressor().compress(data)
+        writer.write_bytes(path, data)
+        return digest
+
+    def put_file(self, path: Path) -> str:
+        """Store a UTF-8 text file without reading it into memory"""
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        blob = self.path(digest)
+        if self._reuse(blob):
+            return digest
+
+        # A copy, never a link: the source file may be changed in place
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = blob.with_name(f".{blob.name}.tmp")
+        with open(path, "rb") as src, open(tmp_file, "wb") as raw:
+            if self.compression == "none":
+                shutil.copyfileobj(src, raw)
+            else:
+                if self.compression == "gzip":
+                    dst = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0)
+                else:
+                    dst = zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+                with dst:
+                    shutil.copyfileobj(src, dst)
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp_file, blob)
+        return digest
+
+    def sweep(self, referenced: Set[str], grace: float) -> int:
+        """Delete blobs not in referenced; returns how many were deleted.
+
+        Blobs stored or reused in the last grace seconds are kept, since
+        their references may not be saved yet.
+        """
+        cutoff = time.time() - grace
+        deleted = 0
+        for path in self.blob_dir.glob("*/*"):
+            if path.name.startswith(".") or path.name.split(".")[0] in referenced:
+                continue
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            deleted += 1
+        return deleted
+
+    def get(self, digest: Optional[str]) -> Optional[str]:
+        """Return the text for a hash, or None if it is unknown"""
+        if not digest:
+            return None
+        for compression in SUFFIXES:
+            try:
+                data = writer.read_bytes(self._path(digest, compression))
+            except FileNotFoundError:
+                continue
+            if compression == "gzip":
+                data = gzip.decompress(data)
+            elif compression == "zstd":
+                if zstandard is None:
+                    logger.error("Blob %s needs zstandard to be read", digest)
+                    return None
+                data = zstandard.ZstdDecompressor().decompress(data)
+            return data.decode()
+
+        logger.warning("Blob %s not found", digest)
+        return None
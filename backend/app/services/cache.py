@@ -0,0 +1,132 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.services.blobs import BlobStore
+from app.services.persistence import writer
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Key/value cache with per-entry timestamps, optionally persisted to a JSON file.
+
+    The TTL is supplied on lookup rather than on insert, so a changed
+    cache duration setting applies to entries that are already stored.
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None, max_age: int = 0):
+        self.cache_file = cache_file
+        self.max_age = max_age
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._mtime: Optional[float] = None
+        self._load()
+
+    def _load(self):
+        """Load entries from disk if the file changed since the last read"""
+        if not self.cache_file:
+            return
+        try:
+            mtime = self.cache_file.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.cache_file, "r") as f:
+                self._entries = json.load(f)
+            self._mtime = mtime
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Failed to load cache %s: %s", self.cache_file, e)
+
+    def _prune(self):
+        """Drop entries older than max_age"""
+        if self.max_age:
+            cutoff = time.time() - self.max_age
+            self._entries = {
+                k: v for k, v in self._entries.items() if v["stored_at"] >= cutoff
+            }
+
+    def _save(self):
+        """Write entries to disk"""
+        if not self.cache_file:
+            return
+        tmp_file = self.cache_file.with_suffix(".tmp")
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+            self._mtime = self.cache_file.stat().st_mtime
+        except OSError as e:
+            logger.warning("Failed to save cache %s: %s", self.cache_file, e)
+
+    def get(self, key: str, ttl: int) -> Optional[Any]:
+        """Return the cached value if it is younger than ttl seconds"""
+        if ttl <= 0:
+            return None
+        self._load()
+        entry = self._entries.get(key)
+        if not entry or time.time() - entry["stored_at"] > ttl:
+            return None
+        return entry["value"]
+
+    def set(self, key: str, value: Any):
+        self._load()
+        self._prune()
+        self._entries[key] = {"value": value, "stored_at": time.time()}
+        self._save()
+
+    def delete(self, key: str):
+        self._load()
+        if self._entries.pop(key, None) is not None:
+            self._save()
+
+
+class TranslationCache:
+    """Translations keyed by source text, languages and provider.
+
+    Each entry is a small file under DATA_DIR/translation_cache naming the
+    blob of the translated text, so concurrent workers and repeated
+    translate_files.py runs share entries without a common index file.
+    """
+
+    def __init__(
+        self, cache_dir: Optional[Path] = None, blob_store: Optional[BlobStore] = None
+    ):
+        self.cache_dir = cache_dir or settings.DATA_DIR / "translation_cache"
+        self.blob_store = blob_store or BlobStore()
+
+    def _path(self, text: str, source_lang: str, target_lang: str, provider: str):
+        key = hashlib.sha256(
+            f"{provider}\0{source_lang}\0{target_lang}\0{text}".encode()
+        ).hexdigest()
+        return self.cache_dir / key[:2] / key
+
+    def get(
+        self, text: str, source_lang: str, target_lang: str, provider: str
+    ) -> Optional[str]:
+        try:
+            digest = writer.read_text(
+                self._path(text, source_lang, target_lang, provider)
+            )
+        except FileNotFoundError:
+            return None
+        return self.blob_store.get(digest.strip())
+
+    def set(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        provider: str,
+        translated_text: str,
+    ):
+        writer.write_text(
+            self._path(text, source_lang, target_lang, provider),
+            self.blob_store.put(translated_text),
+        )
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+
+from yt_dlp.cookies import YoutubeDLCookieJar, extract_cookies_from_browser
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Only the cookies yt-dlp needs for YouTube are written to disk
+COOKIE_DOMAINS = ("youtube.com", "google.com", "youtu.be")
+
+# yt-dlp errors that mean the exported cookies are stale or rejected
+AUTH_FAILURE_RE = re.compile(
+    rb"Sign in to confirm|cookies are no longer valid|login required"
+    rb"|use --cookies",
+    re.IGNORECASE,
+)
+
+
+class CookieJarManager:
+    """Export browser cookies once into a Netscape cookie file for yt-dlp.
+
+    Passing --cookies-from-browser makes every yt-dlp run locate and decrypt
+    the browser's cookie database. The export happens here instead, at most
+    once per COOKIE_TTL or after an auth failure. yt-dlp saves the jar back
+    when it exits, so each run gets a private copy of the export and the
+    shared file is only ever replaced whole.
+    """
+
+    def __init__(self, cookie_dir: Optional[Path] = None, ttl: Optional[int] = None):
+        self.cookie_dir = cookie_dir or settings.DATA_DIR / "cookies"
+        self.ttl = settings.COOKIE_TTL if ttl is None else ttl
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # When the browser was last read; copying the export for a run
+        # must not count as a fresh export
+        self._exported_at: Dict[str, float] = {}
+
+    def cookie_file(self, browser: str) -> Path:
+        name = re.sub(r"[^\w.-]", "_", browser)
+        return self.cookie_dir / f"{name}.txt"
+
+    def _is_fresh(self, browser: str, path: Path) -> bool:
+        exported_at = self._exported_at.get(browser)
+        return (
+            exported_at is not None
+            and time.time() - exported_at < self.ttl
+            and path.exists()
+        )
+
+    def _export(self, browser: str, path: Path):
+        """Decrypt the browser's cookies and save the YouTube ones to path"""
+        source = extract_cookies_from_browser(browser)
+        jar = YoutubeDLCookieJar()
+        for cookie in source:
+            if cookie.domain.lstrip(".").endswith(COOKIE_DOMAINS):
+                jar.set_cookie(cookie)
+
+        self.cookie_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_suffix(".tmp")
+        jar.save(str(tmp_file), ignore_discard=True, ignore_expires=True)
+        os.chmod(tmp_file, 0o600)
+        os.replace(tmp_file, path)
+        logger.info("Exported %d %s cookies to %s", len(jar), browser, path)
+
+    def _copy_for_run(self, path: Path) -> Path:
+        """Copy the export to a private file for a single yt-dlp run"""
+        fd, name = tempfile.mkstemp(
+            prefix=f"{path.stem}.", suffix=".run.txt", dir=self.cookie_dir
+        )
+        with os.fdopen(fd, "wb") as dst, open(path, "rb") as src:
+            shutil.copyfileobj(src, dst)
+        return Path(name)
+
+    @asynccontextmanager
+    async def get_args(
+        self, browser: str, refresh: bool = False
+    ) -> AsyncIterator[List[str]]:
+        """Yield the yt-dlp cookie arguments for browser ("none" for no cookies).
+
+        The cookie file is a copy of the export that is deleted when the
+        block exits. Falls back to --cookies-from-browser if the export fails.
+        """
+        if not browser or browser == "none":
+            yield []
+            return
+
+        path = self.cookie_file(browser)
+        lock = self._locks.setdefault(browser, asyncio.Lock())
+        async with lock:
+            if refresh or not self._is_fresh(browser, path):
+                try:
+                    await asyncio.to_thread(self._export, browser, path)
+                    self._exported_at[browser] = time.time()
+                except Exception as e:
+                    logger.warning("Cookie export from %s failed: %s", browser, e)
+                    path = None
+            if path is not None:
+                run_file = await asyncio.to_thread(self._copy_for_run, path)
+
+        if path is None:
+            yield ["--cookies-from-browser", browser]
+            return
+        try:
+            yield ["--cookies", str(run_file)]
+        finally:
+            run_file.unlink(missing_ok=True)
+
+    @staticmethod
+    def is_auth_failure(stderr: bytes) -> bool:
+        return bool(AUTH_FAILURE_RE.search(stderr))
@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiofiles
+
+from app.config import settings
+from app.services.history import HistoryService
+from app.services.persistence import writer
+from app.services.subtitles import iter_chunks, iter_text_segments
+from app.services.translator import TranslationService
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentTranslationService:
+    """Translate documents beyond MAX_TEXT_LENGTH in the background.
+
+    The source text is written to DATA_DIR/documents/<job id>/original.txt
+    and streamed from there through segmentation, chunking and translation;
+    each translated chunk is appended to translation.txt as it arrives, so
+    only one chunk is in memory at a time. The job id is the handle for
+    progress, the partial result and cancellation, and the folder name
+    recorded in history as folder_path.
+    """
+
+    def __init__(
+        self, translator: TranslationService, history_service: HistoryService
+    ):
+        self.translator = translator
+        self.history_service = history_service
+        self.document_dir = settings.DATA_DIR / "documents"
+        self.jobs: Dict[str, Dict] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+
+    def job_dir(self, job_id: str) -> Path:
+        return self.document_dir / job_id
+
+    async def start_job(
+        self,
+        text: str,
+        source_lang: str = "auto",
+        target_lang: str = "en",
+        provider: str = "libretranslate",
+        title: Optional[str] = None,
+        file_name: Optional[str] = None,
+        file_type: Optional[str] = None,
+    ) -> Dict:
+        """Save the source text and schedule its translation"""
+        job_id = str(uuid.uuid4())
+        folder = self.job_dir(job_id)
+        folder.mkdir(parents=True, exist_ok=True)
+        async with aiofiles.open(folder / "original.txt", "w", encoding="utf-8") as f:
+            await f.write(text)
+
+        job = {
+            "id": job_id,
+            "title": title or self.history_service._generate_title(text),
+            "file_name": file_name,
+            "file_type": file_type,
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            "provider": provider,
+            "status": "running",
+            "total_chars": len(text),
+            "translated_chars": 0,
+            "chunks": 0,
+            "entry_id": None,
+            "error": None,
+            "created_at": datetime.now().isoformat(),
+            "finished_at": None,
+            "folder_path": job_id,
+        }
+        self.jobs[job_id] = job
+        self._save_job(job)
+        logger.info("Document %s: %d chars queued", job_id, len(text))
+
+        task = asyncio.create_task(self._run_job(job))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+        return self.get_progress(job_id)
+
+    def _save_job(self, job: Dict):
+        writer.write_json(self.job_dir(job["id"]) / "job.json", dict(job))
+
+    async def _run_job(self, job: Dict):
+        async with self._semaphore:
+            try:
+                await self._translate(job)
+                job["entry_id"] = await self._register(job)
+                job["status"] = "completed"
+            except asyncio.CancelledError:
+                job["status"] = "cancelled"
+                raise
+            except Exception as e:
+                logger.error("Document %s failed: %s", job["id"], e)
+                job["status"] = "failed"
+                job["error"] = str(e)
+            finally:
+                job["finished_at"] = datetime.now().isoformat()
+                self._save_job(job)
+                logger.info("Document %s %s", job["id"], job["status"])
+
+    async def _translate(self, job: Dict):
+        folder = self.job_dir(job["id"])
+        source_lang = job["source_lang"]
+
+        # The source file is read and segmented in a thread, chunk by chunk
+        with await asyncio.to_thread(
+            open, folder / "original.txt", encoding="utf-8"
+        ) as source:
+            chunks = iter_chunks(
+                iter_text_segments(
+                    source, settings.PARAGRAPH_MIN_CHARS, settings.PARAGRAPH_MAX_CHARS
+                ),
+                settings.CHUNK_SIZE,
+            )
+            async with aiofiles.open(
+                folder / "translation.txt", "w", encoding="utf-8"
+            ) as out:
+                while chunk := await asyncio.to_thread(next, chunks, None):
+                    result = await asyncio.wait_for(
+                        self.translator.translate(
+                            chunk, source_lang, job["target_lang"], job["provider"]
+                        ),
+                        settings.TRANSLATION_TIMEOUT,
+                    )
+                    # Translate the remaining chunks from the detected language
+                    detected = result.get("detectedLanguage")
+                    if source_lang == "auto" and isinstance(detected, dict):
+                        source_lang = detected.get("language") or source_lang
+                        job["source_lang"] = source_lang
+
+                    if job["chunks"]:
+                        await out.write("\n\n")
+                    await out.write(result["translatedText"])
+                    await out.flush()
+
+                    job["chunks"] += 1
+                    job["translated_chars"] += len(chunk)
+                    self._save_job(job)
+
+    async def _register(self, job: Dict) -> str:
+        """Store both texts as blobs and add the document to history.
+
+        Only the blob writes run in a thread; history is changed on the
+        event loop like every other HistoryService caller.
+        """
+        folder = self.job_dir(job["id"])
+        put_file = self.history_service.blob_store.put_file
+        original_hash = await asyncio.to_thread(put_file, folder / "original.txt")
+        translated_hash = await asyncio.to_thread(put_file, folder / "translation.txt")
+        return self.history_service.add_document_entry(
+            original_text_hash=original_hash,
+            translated_text_hash=translated_hash,
+            source_lang=job["source_lang"],
+            target_lang=job["target_lang"],
+            provider=job["provider"],
+            title=job["title"],
+            folder_path=job["folder_path"],
+            file_name=job["file_name"],
+            file_type=job["file_type"],
+        )
+
+    def get_progress(self, job_id: str) -> Optional[Dict]:
+        job = self.jobs.get(job_id)
+        if not job:
+            return None
+
+        total = job["total_chars"]
+        return {
+            **job,
+            "progress": 1.0
+            if job["status"] == "completed" or not total
+            else min(job["translated_chars"] / total, 1.0),
+        }
+
+    def list_jobs(self) -> List[Dict]:
+        return [self.get_progress(job_id) for job_id in reversed(list(self.jobs))]
+
+    def result_path(self, job_id: str) -> Optional[Path]:
+        """translation.txt of a job, partial while it is running"""
+        if job_id not in self.jobs:
+            return None
+        path = self.job_dir(job_id) / "translation.txt"
+        return path if path.exists() else None
+
+    async def cancel_job(self, job_id: str) -> Optional[Dict]:
+        """Stop a running job; its partial translation stays in the folder"""
+        if job_id not in self.jobs:
+            return None
+
+        task = self._tasks.get(job_id)
+        if task:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        return self.get_progress(job_id)
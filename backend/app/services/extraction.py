@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import List, Optional
+
+import pdfplumber
+from docx import Document
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Worker functions run in the pool processes and must stay module-level
+
+
+def _pdf_page_count(path: str) -> int:
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def _pdf_pages_text(path: str, start: int, end: int) -> List[str]:
+    with pdfplumber.open(path) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages[start:end]]
+
+
+def _docx_text(path: str) -> str:
+    doc = Document(path)
+    return "\n\n".join(p.text for p in doc.paragraphs if p.text.strip())
+
+
+class DocumentExtractor:
+    """Extract PDF and DOCX text in a process pool, off the event loop.
+
+    PDFs longer than PDF_PAGES_PER_TASK pages are split into page ranges
+    that are extracted in parallel and joined in page order. Each document
+    has EXTRACTION_TIMEOUT seconds; on timeout its queued page ranges are
+    cancelled (a range already running finishes in its worker).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or settings.EXTRACTION_WORKERS or os.cpu_count()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and writer
+            # threads is not safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        try:
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            # A crashed worker breaks the whole pool; start a fresh one next time
+            if self._executor is executor:
+                self._executor = None
+            raise
+
+    async def _with_timeout(self, work, timeout: Optional[float]):
+        try:
+            return await asyncio.wait_for(work, timeout or settings.EXTRACTION_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(
+                f"Document extraction timed out after "
+                f"{timeout or settings.EXTRACTION_TIMEOUT}s"
+            )
+
+    async def extract_pdf(self, path: Path, timeout: Optional[float] = None) -> str:
+        """Extract the text of a PDF, page-parallel for long documents"""
+
+        async def extract():
+            page_count = await self._run(_pdf_page_count, str(path))
+            step = max(settings.PDF_PAGES_PER_TASK, 1)
+            ranges = [(i, min(i + step, page_count)) for i in range(0, page_count, step)]
+            logger.info(
+                "Extracting %d PDF pages in %d task(s)", page_count, len(ranges)
+            )
+            chunks = await asyncio.gather(
+                *(self._run(_pdf_pages_text, str(path), s, e) for s, e in ranges)
+            )
+            return "\n\n".join(text for chunk in chunks for text in chunk if text)
+
+        return await self._with_timeout(extract(), timeout)
+
+    async def extract_docx(self, path: Path, timeout: Optional[float] = None) -> str:
+        return await self._with_timeout(self._run(_docx_text, str(path)), timeout)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# One pool per process, shared by every FileHandler
+extractor = DocumentExtractor()
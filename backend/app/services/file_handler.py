@@ -1,14 +1,22 @@
-import re
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
+import codecs
+import os
+import tempfile
 import aiofiles
-import chardet
+from chardet.universaldetector import UniversalDetector
 from fastapi import UploadFile
-import pdfplumber
-from docx import Document
 import json
 import yaml
 
+from app.config import settings
+from app.services.extraction import extractor
+from app.services.subtitles import Cue, cues_to_text, dedupe_cues, parse_timed_text
+
+
+class FileTooLargeError(ValueError):
+    pass
+
 
 class FileHandler:
     def __init__(self):
@@ -31,80 +39,108 @@ class FileHandler:
             raise ValueError(f"Unsupported file format: {file_ext}")
     
     async def _extract_plain_text(self, file: UploadFile) -> Tuple[str, str]:
-        content = await file.read()
-        
-        detected = chardet.detect(content)
-        encoding = detected['encoding'] or 'utf-8'
-        
+        # The encoding is detected from a prefix while spooling, then the
+        # spooled file is decoded (again as latin-1 if that guess fails)
+        detector = UniversalDetector()
+        path = await self._spool(file, '.txt', detector)
         try:
-            text = content.decode(encoding)
-        except UnicodeDecodeError:
-            text = content.decode('latin-1')
+            detector.close()
+            encoding = detector.result['encoding'] or 'utf-8'
+            if encoding == 'ascii':
+                # An ASCII prefix says nothing about the rest of the file
+                encoding = 'utf-8'
+            
+            try:
+                text = await self._decode_file(path, encoding)
+            except UnicodeDecodeError:
+                text = await self._decode_file(path, 'latin-1')
+        finally:
+            os.unlink(path)
         
         return text, "text"
     
     async def _extract_subtitle(self, file: UploadFile) -> Tuple[str, str]:
-        content = await file.read()
-        text = content.decode('utf-8', errors='ignore')
+        text = await self._read_text(file)
         
         clean_text = self.clean_subtitle(text)
         return clean_text, "subtitle"
     
-    def clean_subtitle(self, subtitle_content: str) -> str:
-        lines = subtitle_content.split('\n')
-        clean_lines = []
-        seen = set()
-        
-        for line in lines:
-            line = line.strip()
-            
-            if not line:
-                continue
-            if line == "WEBVTT":
-                continue
-            if line.startswith("Kind:") or line.startswith("Language:"):
-                continue
-            if "-->" in line:
-                continue
-            if re.match(r'^\d+$', line):
-                continue
-            if re.match(r'^\d{2}:\d{2}', line):
-                continue
-            
-            line = re.sub(r'<[^>]+>', '', line)
-            
-            if line and line not in seen:
-                seen.add(line)
-                clean_lines.append(line)
+    async def extract_cues(self, file: UploadFile) -> List[Cue]:
+        """Parse an SRT/VTT upload into cues, keeping every cue's timing"""
+        file_ext = Path(file.filename).suffix.lower()
+        if file_ext not in ['.srt', '.vtt']:
+            raise ValueError(f"Not a subtitle file: {file_ext}")
         
-        return '\n'.join(clean_lines)
+        cues = parse_timed_text(await self._read_text(file))
+        if not cues:
+            raise ValueError("No subtitle cues found")
+        return cues
+    
+    def clean_subtitle(self, subtitle_content: str) -> str:
+        return cues_to_text(dedupe_cues(parse_timed_text(subtitle_content)))
     
     async def _extract_pdf(self, file: UploadFile) -> Tuple[str, str]:
-        content = await file.read()
-        text = []
-        
-        with pdfplumber.open(io.BytesIO(content)) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text.append(page_text)
-        
-        return '\n\n'.join(text), "pdf"
+        # Pool workers read the document from disk rather than receiving its bytes
+        path = await self._spool(file, '.pdf')
+        try:
+            return await extractor.extract_pdf(path), "pdf"
+        finally:
+            os.unlink(path)
     
     async def _extract_docx(self, file: UploadFile) -> Tuple[str, str]:
-        content = await file.read()
-        doc = Document(io.BytesIO(content))
-        
-        text = []
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text.append(paragraph.text)
-        
-        return '\n\n'.join(text), "docx"
+        path = await self._spool(file, '.docx')
+        try:
+            return await extractor.extract_docx(path), "docx"
+        finally:
+            os.unlink(path)
+    
+    async def _chunks(self, file: UploadFile) -> AsyncIterator[bytes]:
+        """Read the upload in chunks, enforcing MAX_FILE_SIZE_MB"""
+        limit = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+        size = 0
+        while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > limit:
+                raise FileTooLargeError(f"File size exceeds {settings.MAX_FILE_SIZE_MB}MB limit")
+            yield chunk
+    
+    async def _spool(self, file: UploadFile, suffix: str,
+                     detector: Optional[UniversalDetector] = None) -> Path:
+        """Copy the upload to UPLOAD_DIR, feeding its prefix to detector"""
+        fd, name = tempfile.mkstemp(suffix=suffix, dir=settings.UPLOAD_DIR)
+        os.close(fd)
+        sniffed = 0
+        try:
+            async with aiofiles.open(name, 'wb') as f:
+                async for chunk in self._chunks(file):
+                    if detector and not detector.done and sniffed < settings.ENCODING_SNIFF_BYTES:
+                        prefix = chunk[:settings.ENCODING_SNIFF_BYTES - sniffed]
+                        detector.feed(prefix)
+                        sniffed += len(prefix)
+                    await f.write(chunk)
+        except BaseException:
+            os.unlink(name)
+            raise
+        return Path(name)
+    
+    async def _decode_file(self, path: Path, encoding: str) -> str:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        parts = []
+        async with aiofiles.open(path, 'rb') as f:
+            while chunk := await f.read(settings.UPLOAD_CHUNK_SIZE):
+                parts.append(decoder.decode(chunk))
+        parts.append(decoder.decode(b'', final=True))
+        return ''.join(parts)
+    
+    async def _read_text(self, file: UploadFile) -> str:
+        """Decode a UTF-8 upload chunk by chunk, dropping invalid bytes"""
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        parts = [decoder.decode(chunk) async for chunk in self._chunks(file)]
+        parts.append(decoder.decode(b'', final=True))
+        return ''.join(parts)
     
     async def _extract_structured(self, file: UploadFile) -> Tuple[str, str]:
-        content = await file.read()
-        text = content.decode('utf-8', errors='ignore')
+        text = await self._read_text(file)
         
         file_ext = Path(file.filename).suffix.lower()
         
@@ -119,8 +155,8 @@ class FileHandler:
         file_path = directory / file.filename
         
         async with aiofiles.open(file_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+            async for chunk in self._chunks(file):
+                await f.write(chunk)
         
         return file_path
     
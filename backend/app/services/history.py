@@ -1,40 +1,377 @@
+import hashlib
 import json
 import logging
+import shutil
+import threading
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Set, Tuple
 
-from app.models.translation import TranslationHistory
+from app.models.translation import HistoryChanges, HistoryRecord, TranslationHistory
 from app.config import settings
+from app.services.blobs import BlobStore
+from app.services.persistence import writer
 
 logger = logging.getLogger(__name__)
 
+# Entry texts live in the blob store; entries keep "<field>_hash" references
+TEXT_FIELDS = ("original_text", "translated_text")
+
+# Source fields shared by every translation of a record
+RECORD_FIELDS = (
+    "type",
+    "title",
+    "video_id",
+    "youtube_url",
+    "available_languages",
+    "video_info",
+    "folder_path",
+    "file_name",
+    "file_type",
+)
+
+HISTORY_VERSION = 2
+
 
 class HistoryService:
+    """Translation history stored as one record per source text.
+
+    A record holds a source transcript or text (for YouTube, one per video
+    and source language) and its translations keyed by target language:
+
+        {"version": 2, "records": [{"id", "source_lang",
+            "original_text_hash", ..., "translations": {"de": {"id",
+            "target_lang", "translated_text_hash", "provider", ...}}}]}
+
+    The API still lists flat entries, one per translation (or one per
+    record without translations). A record's first translation reuses the
+    record id, so an entry id stays valid once it gets translated. Indexes
+    by entry id and by (video_id, source_lang) are kept in memory and
+    rebuilt only when history.json changes on disk.
+
+    history.json also holds a revision counter that every write increments,
+    so clients can revalidate cached lists with one comparison, and a log
+    of the last HISTORY_CHANGE_LOG_SIZE writes (records upserted, entry ids
+    deleted) from which get_changes answers delta syncs.
+    """
+
     def __init__(self):
         self.history_file = settings.DATA_DIR / "history.json"
+        self.blob_store = BlobStore()
+        self._records: Dict[str, Dict] = {}  # newest first
+        self._entry_index: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._video_index: Dict[Tuple[str, str], str] = {}
+        self._entries: Optional[List[Dict]] = None
+        self._file_state: Optional[Tuple[int, int]] = None
+        self._revision = 0
+        self._changes: List[Dict] = []  # oldest first, one per revision
         self._ensure_history_file()
 
     def _ensure_history_file(self):
-        """Ensure the history file exists with empty array"""
+        """Ensure the history file exists with no records"""
         if not self.history_file.exists():
             self.history_file.parent.mkdir(parents=True, exist_ok=True)
             with open(self.history_file, "w") as f:
-                json.dump([], f)
+                json.dump(
+                    {
+                        "version": HISTORY_VERSION,
+                        "revision": 0,
+                        "changes": [],
+                        "records": [],
+                    },
+                    f,
+                )
+
+    def _load_history(self):
+        """Load records if history.json changed since the last read"""
+        if writer.pending(self.history_file):
+            return  # the queued save is newer than the file
+        try:
+            stat = self.history_file.stat()
+        except FileNotFoundError:
+            stat = None
+        file_state = (stat.st_mtime_ns, stat.st_size) if stat else None
+        if file_state is not None and file_state == self._file_state:
+            return
 
-    def _load_history(self) -> List[Dict]:
-        """Load all history entries"""
         try:
             with open(self.history_file, "r") as f:
-                return json.load(f)
+                data = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
-            return []
+            data = {"records": []}
+
+        if isinstance(data, list):
+            self._set_records(self._migrate(data))
+            self._save_history({"reset": True})
+            return
+
+        self._set_records(data.get("records", []))
+        self._revision = data.get("revision", 0)
+        self._changes = data.get("changes", [])
+        self._file_state = file_state
+
+    def _save_history(self, change: Dict):
+        """Queue all records for an atomic write of history.json.
+
+        change ({"records": [...], "deleted": [...]} or {"reset": True})
+        is logged under the new revision. The writer works in queue order,
+        so the blobs the records reference reach disk first.
+        """
+        self._revision += 1
+        self._changes.append({"revision": self._revision, **change})
+        del self._changes[: -settings.HISTORY_CHANGE_LOG_SIZE]
+        data = {
+            "version": HISTORY_VERSION,
+            "revision": self._revision,
+            "changes": self._changes,
+            "records": list(self._records.values()),
+        }
+        writer.write_text(
+            self.history_file,
+            json.dumps(data, indent=2, default=str, ensure_ascii=False),
+            on_written=self._saved,
+        )
+
+    def _saved(self):
+        """Remember the state of our own write so it is not loaded again"""
+        stat = self.history_file.stat()
+        self._file_state = (stat.st_mtime_ns, stat.st_size)
+
+    def _set_records(self, records: List[Dict]):
+        """Replace the in-memory records and rebuild the indexes"""
+        self._records = {record["id"]: record for record in records}
+        self._reindex()
+
+    def _reindex(self):
+        self._entry_index = {}
+        self._video_index = {}
+        self._entries = None
+        for record_id, record in self._records.items():
+            for alias in [record_id, *record.get("aliases", [])]:
+                self._entry_index.setdefault(alias, (record_id, None))
+            for target_lang, translation in record["translations"].items():
+                self._entry_index[translation["id"]] = (record_id, target_lang)
+            if record.get("type") == "youtube" and record.get("video_id"):
+                key = (record["video_id"], record["source_lang"])
+                self._video_index.setdefault(key, record_id)
+
+    def _commit(
+        self,
+        records: Iterable[str] = (),
+        deleted: Iterable[str] = (),
+        reset: bool = False,
+    ):
+        """Persist a change made to the in-memory records.
+
+        records are the ids of records added or changed, deleted the ids of
+        entries removed from the list; reset stands for any other change.
+        """
+        records = list(records)
+        self._reindex()
+        if reset:
+            self._save_history({"reset": True})
+        else:
+            self._save_history({"records": records, "deleted": list(deleted)})
+
+    def _migrate(self, history: List[Dict]) -> List[Dict]:
+        """Convert the flat v1 entry list into records.
+
+        YouTube entries for the same video and source language become one
+        record; their ids are kept as translation ids or record aliases so
+        existing links still resolve. The v1 file is kept as a backup.
+        """
+        backup_file = self.history_file.with_suffix(".json.v1-backup")
+        shutil.copyfile(self.history_file, backup_file)
+        logger.info("Migrating %d history entries (backup: %s)", len(history), backup_file)
+
+        records: Dict[Any, Dict] = {}
+        for entry in reversed(history):  # oldest first, so newer entries win
+            for field in TEXT_FIELDS:
+                if field in entry:
+                    text = entry.pop(field)
+                    entry[f"{field}_hash"] = self.blob_store.put(text) if text else None
+
+            if entry.get("type") == "youtube" and entry.get("video_id"):
+                key = (entry["video_id"], entry.get("source_lang"))
+            else:
+                key = entry["id"]
+
+            record = records.get(key)
+            if record is None:
+                record = self._new_record(
+                    entry.get("original_text_hash"),
+                    entry.get("source_lang", "auto"),
+                    record_id=entry["id"],
+                    created_at=entry.get("created_at"),
+                    **{field: entry.get(field) for field in RECORD_FIELDS},
+                )
+                records[key] = record
+            else:
+                for field in ("original_text_hash", *RECORD_FIELDS):
+                    if not record.get(field) and entry.get(field):
+                        record[field] = entry[field]
+
+            target_lang = entry.get("target_lang")
+            if entry.get("translated_text_hash") and target_lang:
+                replaced = record["translations"].get(target_lang)
+                if replaced and replaced["id"] != record["id"]:
+                    record["aliases"].append(replaced["id"])
+                record["translations"][target_lang] = {
+                    "id": entry["id"],
+                    "target_lang": target_lang,
+                    "translated_text_hash": entry["translated_text_hash"],
+                    "provider": entry.get("provider") or "libretranslate",
+                    "created_at": entry.get("created_at"),
+                    "updated_at": entry.get("updated_at"),
+                }
+            elif entry["id"] != record["id"]:
+                record["aliases"].append(entry["id"])
+
+        migrated = sorted(
+            records.values(), key=lambda r: r.get("created_at") or "", reverse=True
+        )
+        logger.info("Migrated history into %d records", len(migrated))
+        return migrated
+
+    def _new_record(
+        self,
+        original_text_hash: Optional[str],
+        source_lang: str,
+        record_id: Optional[str] = None,
+        created_at: Optional[str] = None,
+        **fields,
+    ) -> Dict:
+        record = {
+            "id": record_id or str(uuid.uuid4()),
+            "source_lang": source_lang,
+            "original_text_hash": original_text_hash,
+            "created_at": created_at or datetime.now().isoformat(),
+            "updated_at": None,
+            "aliases": [],
+            "translations": {},
+        }
+        for field in RECORD_FIELDS:
+            record[field] = fields.get(field)
+        return record
 
-    def _save_history(self, history: List[Dict]):
-        """Save history entries to file"""
-        with open(self.history_file, "w") as f:
-            json.dump(history, f, indent=2, default=str, ensure_ascii=False)
+    def _insert_record(self, record: Dict):
+        """Add a record at the front (newest first)"""
+        self._records = {record["id"]: record, **self._records}
+
+    def _set_translation(
+        self,
+        record: Dict,
+        target_lang: str,
+        translated_text: str,
+        provider: str,
+        preferred_id: Optional[str] = None,
+        touch: bool = True,
+        translated_text_hash: Optional[str] = None,
+    ) -> str:
+        """Add or replace the translation of record into target_lang.
+
+        touch=False is for records created in the same call, which have
+        not been updated yet. translated_text_hash stands in for a text
+        that is already in the blob store.
+        """
+        now = datetime.now().isoformat()
+        digest = translated_text_hash or (
+            self.blob_store.put(translated_text) if translated_text else None
+        )
+        translation = record["translations"].get(target_lang)
+
+        if translation:
+            translation["translated_text_hash"] = digest
+            translation["provider"] = provider
+            translation["updated_at"] = now
+        else:
+            in_use = {t["id"] for t in record["translations"].values()}
+            for translation_id in (preferred_id, record["id"]):
+                if translation_id and translation_id not in in_use:
+                    break
+            else:
+                translation_id = str(uuid.uuid4())
+            # The entry that inherits the record id keeps its place in the list
+            inherits = translation_id == record["id"]
+            translation = {
+                "id": translation_id,
+                "target_lang": target_lang,
+                "translated_text_hash": digest,
+                "provider": provider,
+                "created_at": record["created_at"] if inherits else now,
+                "updated_at": now if inherits and touch else None,
+            }
+            record["translations"][target_lang] = translation
+
+        if touch:
+            record["updated_at"] = now
+        return translation["id"]
+
+    def _entry(self, record: Dict, translation: Optional[Dict] = None) -> Dict:
+        """Flat entry view of a record or one of its translations (no texts)"""
+        entry = {field: record.get(field) for field in RECORD_FIELDS}
+        entry.update(
+            {
+                "id": record["id"],
+                "record_id": record["id"],
+                "source_lang": record["source_lang"],
+                "target_lang": record["source_lang"],
+                "provider": "libretranslate",
+                "original_text_hash": record.get("original_text_hash"),
+                "translated_text_hash": None,
+                "created_at": record["created_at"],
+                "updated_at": record.get("updated_at"),
+            }
+        )
+        if translation:
+            entry.update(
+                {
+                    "id": translation["id"],
+                    "target_lang": translation["target_lang"],
+                    "provider": translation["provider"],
+                    "translated_text_hash": translation["translated_text_hash"],
+                    "created_at": translation["created_at"],
+                    "updated_at": translation.get("updated_at"),
+                }
+            )
+        return entry
+
+    def _record_entries(self, record: Dict) -> List[Dict]:
+        """Flat entries of a record: its translations, or the record itself"""
+        translations = record["translations"].values()
+        if translations:
+            return [self._entry(record, t) for t in translations]
+        return [self._entry(record)]
+
+    def _all_entries(self) -> List[Dict]:
+        """Flat entries, newest first"""
+        self._load_history()
+        if self._entries is None:
+            entries = []
+            for record in self._records.values():
+                entries.extend(self._record_entries(record))
+            entries.sort(key=lambda e: e["created_at"] or "", reverse=True)
+            self._entries = entries
+        return self._entries
+
+    def _with_texts(self, entry: Dict) -> Dict:
+        """Return a copy of entry with its texts read from the blob store"""
+        entry = dict(entry)
+        for field in TEXT_FIELDS:
+            if field not in entry:
+                entry[field] = self.blob_store.get(entry.get(f"{field}_hash")) or ""
+        return entry
+
+    def _lookup(self, entry_id: str) -> Optional[Tuple[Dict, Optional[Dict]]]:
+        """Resolve an entry id to its record and translation (if any)"""
+        self._load_history()
+        location = self._entry_index.get(entry_id)
+        if not location:
+            return None
+        record = self._records[location[0]]
+        translation = record["translations"].get(location[1]) if location[1] else None
+        return record, translation
 
     def add_translation_entry(
         self,
@@ -48,25 +385,58 @@ class HistoryService:
         youtube_url: Optional[str] = None,
     ) -> str:
         """Add a translation entry to history"""
-        history = self._load_history()
-
-        entry_id = str(uuid.uuid4())
-        entry = {
-            "id": entry_id,
-            "title": title or self._generate_title(original_text),
-            "original_text": original_text,
-            "translated_text": translated_text,
-            "source_lang": source_lang,
-            "target_lang": target_lang,
-            "provider": provider,
-            "created_at": datetime.now().isoformat(),
-            "video_id": video_id,
-            "youtube_url": youtube_url,
-            "type": "youtube" if video_id else "text",
-        }
+        self._load_history()
+
+        record = self._new_record(
+            self.blob_store.put(original_text) if original_text else None,
+            source_lang,
+            title=title or self._generate_title(original_text),
+            video_id=video_id,
+            youtube_url=youtube_url,
+            type="youtube" if video_id else "text",
+        )
+        self._insert_record(record)
+        entry_id = self._set_translation(
+            record, target_lang, translated_text, provider, touch=False
+        )
+        self._commit(records=[record["id"]])
 
-        history.insert(0, entry)  # Add to beginning (newest first)
-        self._save_history(history)
+        return entry_id
+
+    def add_document_entry(
+        self,
+        original_text_hash: str,
+        translated_text_hash: str,
+        source_lang: str,
+        target_lang: str,
+        provider: str,
+        title: str,
+        folder_path: str,
+        file_name: Optional[str] = None,
+        file_type: Optional[str] = None,
+    ) -> str:
+        """Add a translated document whose texts are already in the blob store"""
+        self._load_history()
+
+        record = self._new_record(
+            original_text_hash,
+            source_lang,
+            title=title,
+            type="file",
+            folder_path=folder_path,
+            file_name=file_name,
+            file_type=file_type,
+        )
+        self._insert_record(record)
+        entry_id = self._set_translation(
+            record,
+            target_lang,
+            None,
+            provider,
+            touch=False,
+            translated_text_hash=translated_text_hash,
+        )
+        self._commit(records=[record["id"]])
 
         return entry_id
 
@@ -84,57 +454,57 @@ class HistoryService:
         provider: Optional[str] = None,
         folder_path: Optional[str] = None,
     ) -> str:
-        """Add a YouTube transcript entry to history"""
-        history = self._load_history()
-
-        # Check if this video already exists
-        existing_entry = self.find_youtube_entry(video_id, source_lang, target_lang)
+        """Add a YouTube transcript to history, or a translation to its record"""
+        self._load_history()
+
+        record_id = self._video_index.get((video_id, source_lang))
+        changed = not record_id
+        if record_id:
+            record = self._records[record_id]
+            if folder_path and record.get("folder_path") != folder_path:
+                record["folder_path"] = folder_path
+                changed = True
+        else:
+            record = self._new_record(
+                self.blob_store.put(original_text) if original_text else None,
+                source_lang,
+                type="youtube",
+                title=title,
+                video_id=video_id,
+                youtube_url=url,
+                available_languages=available_languages,
+                video_info=video_info,
+                folder_path=folder_path,
+            )
+            self._insert_record(record)
+            logger.info(
+                "Created new transcript record %s for video %s", record["id"], video_id
+            )
 
-        if existing_entry:
-            # Update existing entry if we have new translation
-            if (
-                translated_text
-                and not existing_entry.get("translated_text", "").strip()
-            ):
-                logger.info(
-                    "Updating existing entry %s with translation", existing_entry["id"]
-                )
-                return self.update_entry_translation(
-                    existing_entry["id"],
+        entry_id = record["id"]
+        if translated_text and target_lang and target_lang != source_lang:
+            existing = record["translations"].get(target_lang)
+            if existing and existing["translated_text_hash"]:
+                logger.info("Returning existing translation %s", existing["id"])
+                entry_id = existing["id"]
+            else:
+                entry_id = self._set_translation(
+                    record,
+                    target_lang,
                     translated_text,
-                    target_lang or source_lang,
                     provider or "libretranslate",
-                    folder_path=folder_path,
+                    touch=bool(record_id),
+                )
+                changed = True
+                logger.info(
+                    "Added %s translation %s to record %s",
+                    target_lang,
+                    entry_id,
+                    record["id"],
                 )
-            logger.info(
-                "Returning existing entry %s (already has translation)",
-                existing_entry["id"],
-            )
-            return existing_entry["id"]
-
-        # Create new entry
-        entry_id = str(uuid.uuid4())
-        entry = {
-            "id": entry_id,
-            "title": title,
-            "original_text": original_text,
-            "translated_text": translated_text or "",
-            "source_lang": source_lang,
-            "target_lang": target_lang or source_lang,
-            "provider": provider or "libretranslate",
-            "created_at": datetime.now().isoformat(),
-            "video_id": video_id,
-            "youtube_url": url,
-            "available_languages": available_languages,
-            "video_info": video_info,
-            "type": "youtube",
-            "folder_path": folder_path,
-        }
-
-        history.insert(0, entry)
-        self._save_history(history)
-        logger.info("Created new transcript entry %s for video %s", entry_id, video_id)
 
+        if changed:
+            self._commit(records=[record["id"]])
         return entry_id
 
     def update_entry_translation(
@@ -145,45 +515,44 @@ class HistoryService:
         provider: str,
         folder_path: Optional[str] = None,
     ) -> str:
-        """Update an existing entry with translation"""
-        history = self._load_history()
-
-        for entry in history:
-            if entry.get("id") == entry_id:
-                entry["translated_text"] = translated_text
-                entry["target_lang"] = target_lang
-                entry["provider"] = provider
-                entry["updated_at"] = datetime.now().isoformat()
-                if folder_path:
-                    entry["folder_path"] = folder_path
-                logger.info(
-                    "Updated entry %s with translation (%s, %s)",
-                    entry_id,
-                    target_lang,
-                    provider,
-                )
-                break
-
-        self._save_history(history)
-        return entry_id
+        """Set the translation of an entry's record into target_lang"""
+        found = self._lookup(entry_id)
+        if not found:
+            logger.warning("Cannot add translation, entry %s not found", entry_id)
+            return entry_id
+
+        record = found[0]
+        if folder_path:
+            record["folder_path"] = folder_path
+        translation_id = self._set_translation(
+            record, target_lang, translated_text, provider, preferred_id=entry_id
+        )
+        self._commit(records=[record["id"]])
+        logger.info(
+            "Updated entry %s with translation (%s, %s)",
+            translation_id,
+            target_lang,
+            provider,
+        )
+        return translation_id
 
     def find_youtube_entry(
         self, video_id: str, source_lang: str, target_lang: Optional[str] = None
     ) -> Optional[Dict]:
         """Find existing YouTube entry by video ID and languages"""
-        history = self._load_history()
-
-        for entry in history:
-            if (
-                entry.get("video_id") == video_id
-                and entry.get("source_lang") == source_lang
-                and entry.get("type") == "youtube"
-            ):
-                # If target_lang specified, it should match
-                if target_lang and entry.get("target_lang") != target_lang:
-                    continue
-                return entry
-
+        self._load_history()
+        record_id = self._video_index.get((video_id, source_lang))
+        if not record_id:
+            return None
+
+        record = self._records[record_id]
+        if not target_lang:
+            return self._entry(record)
+        translation = record["translations"].get(target_lang)
+        if translation:
+            return self._entry(record, translation)
+        if target_lang == source_lang:
+            return self._entry(record)
         return None
 
     def get_youtube_transcript(
@@ -193,20 +562,77 @@ class HistoryService:
         entry = self.find_youtube_entry(video_id, source_lang, target_lang)
 
         if entry:
+            entry = self._with_texts(entry)
             return {
-                "title": entry.get("title", ""),
-                "original_text": entry.get("original_text", ""),
-                "translated_text": entry.get("translated_text", ""),
-                "source_lang": entry.get("source_lang", source_lang),
-                "target_lang": entry.get("target_lang", target_lang or source_lang),
-                "available_languages": entry.get("available_languages", []),
-                "video_info": entry.get("video_info", {}),
+                "title": entry.get("title") or "",
+                "original_text": entry["original_text"],
+                "translated_text": entry["translated_text"],
+                "source_lang": entry["source_lang"],
+                "target_lang": entry["target_lang"],
+                "available_languages": entry.get("available_languages") or [],
+                "video_info": entry.get("video_info") or {},
+                "provider": entry.get("provider"),
                 "cached": True,
-                "entry_id": entry.get("id"),
+                "entry_id": entry["id"],
             }
 
         return None
 
+    @property
+    def revision(self) -> int:
+        """Counter increased by every change to history"""
+        self._load_history()
+        return self._revision
+
+    def entry_revision(self, entry_id: str) -> Optional[str]:
+        """Tag that changes whenever the entry (or its texts) changes.
+
+        Derived from the entry's timestamps, text hashes and record fields,
+        so it is computed without reading any text.
+        """
+        found = self._lookup(entry_id)
+        if not found:
+            return None
+        return _revision_tag(self._entry(*found))
+
+    def record_revision(self, record_id: str) -> Optional[str]:
+        """Like entry_revision, for a record with all of its translations"""
+        found = self._lookup(record_id)
+        if not found:
+            return None
+        return _revision_tag(found[0])
+
+    def get_changes(self, since: int) -> HistoryChanges:
+        """Entries added, changed or deleted after revision since.
+
+        Entries come with their texts, as in get_all_entries. reset means
+        the change log does not reach back to since (or history was
+        cleared or migrated), and the list has to be loaded again.
+        """
+        self._load_history()
+        changes = [c for c in self._changes if c["revision"] > since]
+        covered = since == self._revision or (
+            changes and changes[0]["revision"] == since + 1
+        )
+        if not covered or any(c.get("reset") for c in changes):
+            return HistoryChanges(revision=self._revision, reset=True)
+
+        record_ids = {i: None for c in changes for i in c["records"]}
+        entries = [
+            entry
+            for record_id in record_ids
+            if record_id in self._records
+            for entry in self._record_entries(self._records[record_id])
+        ]
+        entries.sort(key=lambda e: e["created_at"] or "", reverse=True)
+        current = {entry["id"] for entry in entries}
+        deleted = {i: None for c in changes for i in c["deleted"] if i not in current}
+        return HistoryChanges(
+            revision=self._revision,
+            entries=[TranslationHistory(**self._with_texts(e)) for e in entries],
+            deleted=list(deleted),
+        )
+
     def get_all_entries(
         self,
         limit: int = 20,
@@ -215,7 +641,7 @@ class HistoryService:
         target_lang: Optional[str] = None,
     ) -> List[TranslationHistory]:
         """Get all history entries with optional filtering"""
-        history = self._load_history()
+        history = self._all_entries()
 
         # Filter by language if specified
         if source_lang:
@@ -227,34 +653,202 @@ class HistoryService:
         paginated = history[offset : offset + limit]
 
         # Convert to TranslationHistory objects
-        return [TranslationHistory(**item) for item in paginated]
+        return [TranslationHistory(**self._with_texts(item)) for item in paginated]
 
     def get_entry_by_id(self, entry_id: str) -> Optional[TranslationHistory]:
         """Get a specific entry by ID"""
-        history = self._load_history()
-
-        for item in history:
-            if item.get("id") == entry_id:
-                return TranslationHistory(**item)
+        found = self._lookup(entry_id)
+        if not found:
+            return None
+        return TranslationHistory(**self._with_texts(self._entry(*found)))
+
+    def _record_view(self, record: Dict, with_texts: bool = False) -> HistoryRecord:
+        translations = sorted(
+            record["translations"].values(), key=lambda t: t["created_at"] or ""
+        )
+        data = {k: v for k, v in record.items() if k != "translations"}
+        data["translations"] = [
+            {
+                **t,
+                "translated_text": self.blob_store.get(t["translated_text_hash"])
+                if with_texts
+                else None,
+            }
+            for t in translations
+        ]
+        if with_texts:
+            data["original_text"] = self.blob_store.get(record["original_text_hash"])
+        return HistoryRecord(**data)
 
-        return None
+    def list_records(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        video_id: Optional[str] = None,
+        record_type: Optional[str] = None,
+    ) -> List[HistoryRecord]:
+        """List source records with their translations, without texts"""
+        self._load_history()
+        records = self._records.values()
+        if video_id:
+            records = [r for r in records if r.get("video_id") == video_id]
+        if record_type:
+            records = [r for r in records if r.get("type") == record_type]
+        return [self._record_view(r) for r in list(records)[offset : offset + limit]]
+
+    def get_record(self, record_id: str) -> Optional[HistoryRecord]:
+        """Get a record with its source text and every translation.
+
+        Accepts a record id or the id of any of its entries.
+        """
+        found = self._lookup(record_id)
+        if not found:
+            return None
+        return self._record_view(found[0], with_texts=True)
 
     def delete_entry(self, entry_id: str) -> bool:
-        """Delete an entry by ID"""
-        history = self._load_history()
-        original_length = len(history)
-
-        history = [h for h in history if h.get("id") != entry_id]
-
-        if len(history) < original_length:
-            self._save_history(history)
-            return True
-
-        return False
+        """Delete an entry by ID.
+
+        Deleting a translation keeps the record unless it was the last one;
+        deleting a record entry removes all of its translations.
+        """
+        found = self._lookup(entry_id)
+        if not found:
+            return False
+
+        record, translation = found
+        if translation and len(record["translations"]) > 1:
+            del record["translations"][translation["target_lang"]]
+            self._commit(records=[record["id"]], deleted=[translation["id"]])
+        else:
+            deleted = [entry["id"] for entry in self._record_entries(record)]
+            del self._records[record["id"]]
+            self._commit(deleted=deleted)
+        self._collect_blobs()
+        return True
+
+    def export_records(self) -> Iterator[Dict]:
+        """Every record with its texts, newest first, read one at a time.
+
+        The records are copied when this is called; the returned iterator
+        only reads blobs, so it may be consumed on another thread.
+        """
+        self._load_history()
+        records = [
+            {
+                **record,
+                "translations": [dict(t) for t in record["translations"].values()],
+            }
+            for record in self._records.values()
+        ]
+        return self._iter_export(records)
+
+    def _iter_export(self, records: List[Dict]) -> Iterator[Dict]:
+        for record in records:
+            data = {
+                k: v
+                for k, v in record.items()
+                if k not in ("translations", "original_text_hash")
+            }
+            data["original_text"] = self.blob_store.get(record["original_text_hash"])
+            data["translations"] = [
+                {
+                    **{k: v for k, v in t.items() if k != "translated_text_hash"},
+                    "translated_text": self.blob_store.get(t["translated_text_hash"]),
+                }
+                for t in record["translations"]
+            ]
+            yield data
+
+    def import_records(self, records: Iterable[Dict]) -> Tuple[int, int]:
+        """Add exported records in one write; returns (imported, skipped).
+
+        Records whose id, translation ids or YouTube video and source
+        language are already in history are skipped.
+        """
+        self._load_history()
+        imported_ids = []
+        skipped = 0
+        for data in records:
+            translations = data.get("translations") or []
+            ids = [
+                data["id"],
+                *data.get("aliases", []),
+                *(t["id"] for t in translations),
+            ]
+            video_key = (data.get("video_id"), data.get("source_lang"))
+            if any(i in self._entry_index for i in ids) or (
+                data.get("type") == "youtube" and video_key in self._video_index
+            ):
+                skipped += 1
+                continue
+
+            text = data.get("original_text")
+            record = self._new_record(
+                self.blob_store.put(text) if text else None,
+                data.get("source_lang") or "auto",
+                record_id=data["id"],
+                created_at=data.get("created_at"),
+                **{field: data.get(field) for field in RECORD_FIELDS},
+            )
+            record["updated_at"] = data.get("updated_at")
+            record["aliases"] = list(data.get("aliases", []))
+            for t in translations:
+                text = t.get("translated_text")
+                record["translations"][t["target_lang"]] = {
+                    "id": t["id"],
+                    "target_lang": t["target_lang"],
+                    "translated_text_hash": self.blob_store.put(text) if text else None,
+                    "provider": t.get("provider") or "libretranslate",
+                    "created_at": t.get("created_at"),
+                    "updated_at": t.get("updated_at"),
+                }
+
+            self._records[record["id"]] = record
+            for i in ids:
+                self._entry_index.setdefault(i, (record["id"], None))
+            if data.get("type") == "youtube":
+                self._video_index.setdefault(video_key, record["id"])
+            imported_ids.append(record["id"])
+
+        if imported_ids:
+            self._records = dict(
+                sorted(
+                    self._records.items(),
+                    key=lambda item: item[1].get("created_at") or "",
+                    reverse=True,
+                )
+            )
+            self._commit(records=imported_ids)
+        return len(imported_ids), skipped
 
     def clear_all(self):
         """Clear all history entries"""
-        self._save_history([])
+        self._load_history()
+        self._records = {}
+        self._commit(reset=True)
+        self._collect_blobs()
+
+    def _collect_blobs(self):
+        """Delete blobs no longer referenced, on a background thread.
+
+        Besides history records, the meta.json of stored transcripts keep
+        blobs alive.
+        """
+        referenced = {
+            digest
+            for record in self._records.values()
+            for digest in _text_hashes(record)
+            if digest
+        }
+
+        def sweep():
+            referenced.update(_meta_hashes(settings.TRANSCRIPT_DIR))
+            deleted = self.blob_store.sweep(referenced, settings.BLOB_GC_GRACE)
+            if deleted:
+                logger.info("Deleted %d unreferenced blobs", deleted)
+
+        threading.Thread(target=sweep, name="blob-gc", daemon=True).start()
 
     def _generate_title(self, text: str, max_length: int = 50) -> str:
         """Generate a title from text content"""
@@ -267,3 +861,34 @@ class HistoryService:
             return first_sentence
 
         return text[:max_length].strip() + "..."
+
+
+def _text_hashes(record: Dict) -> Iterator[Optional[str]]:
+    """Blob hashes of a record's source text and translations"""
+    yield record.get("original_text_hash")
+    for translation in record["translations"].values():
+        yield translation.get("translated_text_hash")
+
+
+def _meta_hashes(transcript_dir: Path) -> Set[str]:
+    """Blob hashes referenced by the meta.json files of stored transcripts"""
+    hashes = set()
+    for path in transcript_dir.glob("*/meta.json"):
+        try:
+            meta = json.loads(writer.read_text(path))
+        except (OSError, ValueError):
+            continue
+        hashes.update(
+            value for key, value in meta.items() if key.endswith("_hash") and value
+        )
+    return hashes
+
+
+def _revision_tag(data: Dict) -> str:
+    encoded = json.dumps(data, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:20]
+
+
+# One history per process, shared by every router and service so their
+# in-memory indexes never diverge
+history_service = HistoryService()
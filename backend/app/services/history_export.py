@@ -0,0 +1,160 @@
+import json
+import logging
+import re
+import zipfile
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+from fastapi import UploadFile
+
+from app.config import settings
+from app.services.file_handler import FileHandler
+from app.services.history import HistoryService
+
+logger = logging.getLogger(__name__)
+
+# Archive formats and the extension of their per-entry files
+ARCHIVE_EXTENSIONS = {"markdown": "md", "html": "html", "text": "txt"}
+
+
+class _ZipStream:
+    """Write-only sink for zipfile that hands out what was written so far.
+
+    It has tell() but no seek(), so zipfile writes data descriptors after
+    each member instead of seeking back to patch local headers.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+class HistoryExportService:
+    """Stream history out as NDJSON or a zip archive, and import NDJSON.
+
+    Exports are generated record by record, so neither the export nor the
+    archive is held in memory; imports are parsed line by line and added
+    in batches of HISTORY_IMPORT_BATCH records, one history write each.
+
+    The export iterators are created on the event loop, which snapshots the
+    records there; Starlette then runs them in its threadpool, where they
+    only read texts from the blob store.
+    """
+
+    def __init__(self, history_service: HistoryService, file_handler: FileHandler):
+        self.history_service = history_service
+        self.file_handler = file_handler
+
+    def iter_ndjson(self) -> Iterator[bytes]:
+        """One exported record with its texts per line"""
+        return (
+            (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode()
+            for record in self.history_service.export_records()
+        )
+
+    def iter_archive(self, format: str) -> Iterator[bytes]:
+        """A zip with a folder per record holding its original and translations"""
+        return self._archive(self.history_service.export_records(), format)
+
+    def _archive(self, records: Iterator[Dict], format: str) -> Iterator[bytes]:
+        extension = ARCHIVE_EXTENSIONS[format]
+        stream = _ZipStream()
+        with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as archive:
+            for record in records:
+                folder = f"{_slug(record.get('title'))}-{record['id'][:8]}"
+                files = [
+                    (f"original.{record['source_lang']}", record.get("original_text"))
+                ]
+                files += [
+                    (t["target_lang"], t.get("translated_text"))
+                    for t in record["translations"]
+                ]
+                for name, text in files:
+                    if text:
+                        archive.writestr(
+                            f"{folder}/{name}.{extension}",
+                            self.file_handler.format_output(text, format),
+                        )
+                yield stream.take()
+        yield stream.take()
+
+    async def import_ndjson(self, file: UploadFile) -> Dict[str, int]:
+        """Add the records of an NDJSON export that are not in history yet"""
+        counts = {"imported": 0, "skipped": 0, "invalid": 0}
+        batch: List[Dict] = []
+
+        def flush():
+            imported, skipped = self.history_service.import_records(batch)
+            counts["imported"] += imported
+            counts["skipped"] += skipped
+            batch.clear()
+
+        async for line in _iter_lines(file):
+            if not line.strip():
+                continue
+            record = _parse_record(line)
+            if record is None:
+                counts["invalid"] += 1
+                continue
+            batch.append(record)
+            if len(batch) >= settings.HISTORY_IMPORT_BATCH:
+                flush()
+        if batch:
+            flush()
+
+        logger.info("History import: %s", counts)
+        return counts
+
+
+async def _iter_lines(file: UploadFile) -> AsyncIterator[bytes]:
+    """Undecoded lines, so invalid UTF-8 only spoils the line it is in"""
+    pending = b""
+    while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+def _parse_record(line: bytes) -> Optional[Dict]:
+    try:
+        record = json.loads(line.decode())
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    if not isinstance(record, dict) or not _is_id(record.get("id")):
+        return None
+    aliases = record.get("aliases", [])
+    if not isinstance(aliases, list) or not all(_is_id(a) for a in aliases):
+        return None
+    translations = record.get("translations", [])
+    if not isinstance(translations, list) or not all(
+        isinstance(t, dict) and _is_id(t.get("id")) and _is_id(t.get("target_lang"))
+        for t in translations
+    ):
+        return None
+    return record
+
+
+def _is_id(value) -> bool:
+    return isinstance(value, str) and bool(value)
+
+
+def _slug(title: Optional[str]) -> str:
+    return re.sub(r"[^\w-]+", "-", title or "").strip("-")[:60] or "untitled"
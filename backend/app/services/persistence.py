@@ -0,0 +1,180 @@
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+JsonUpdate = Callable[[Dict], Dict]
+
+
+class PersistenceWriter:
+    """Write files on a background thread so requests don't wait on disk I/O.
+
+    Writes are queued per path: a newer write replaces one still queued,
+    and JSON updates are applied in order. Every file is written to a
+    temporary name and renamed into place, so readers never see partial
+    content. read_text and exists see queued content, so callers can read
+    their own writes before they reach disk.
+    """
+
+    def __init__(self):
+        # Values are str (text), bytes, dict (JSON document) or a list of
+        # JsonUpdate; writes happen in queue order
+        self._pending: "OrderedDict[Path, Any]" = OrderedDict()
+        self._inflight: Dict[Path, Any] = {}
+        self._on_written: Dict[Path, Callable[[], None]] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def _queue(
+        self, path: Path, item: Any, on_written: Optional[Callable[[], None]] = None
+    ):
+        with self._cond:
+            self._pending.pop(path, None)
+            self._pending[path] = item
+            if on_written is None:
+                self._on_written.pop(path, None)
+            else:
+                self._on_written[path] = on_written
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="persistence", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def write_text(
+        self, path: Path, text: str, on_written: Optional[Callable[[], None]] = None
+    ):
+        """Queue text for path.
+
+        on_written is called on the writer thread once this text is on
+        disk, unless a newer write of path replaces it first.
+        """
+        self._queue(Path(path), text, on_written)
+
+    def write_bytes(self, path: Path, data: bytes):
+        self._queue(Path(path), data)
+
+    def write_json(self, path: Path, data: Dict):
+        """Queue a JSON document; data must not be mutated afterwards"""
+        self._queue(Path(path), data)
+
+    def update_json(self, path: Path, update: JsonUpdate):
+        """Queue a read-modify-write of an existing JSON file.
+
+        The update is skipped if the file does not exist when it is applied.
+        """
+        path = Path(path)
+        with self._cond:
+            item = self._pending.get(path)
+            if isinstance(item, list):
+                item.append(update)
+            elif item is not None:
+                self._pending[path] = update(json.loads(self.read_text(path)))
+            else:
+                self._queue(path, [update])
+
+    def _lookup(self, path: Path) -> Any:
+        """Newest queued or in-flight content for path (lock must be held)"""
+        item = self._pending.get(path)
+        return item if item is not None else self._inflight.get(path)
+
+    def read_bytes(self, path: Path) -> bytes:
+        path = Path(path)
+        with self._cond:
+            item = self._lookup(path)
+            if isinstance(item, bytes):
+                return item
+            if isinstance(item, str):
+                return item.encode()
+            if isinstance(item, dict):
+                return _dump_json(item).encode()
+            if isinstance(item, list):
+                self._cond.wait_for(lambda: self._lookup(path) is None)
+        return path.read_bytes()
+
+    def read_text(self, path: Path) -> str:
+        path = Path(path)
+        with self._cond:
+            item = self._lookup(path)
+            if isinstance(item, str):
+                return item
+            if isinstance(item, dict):
+                return _dump_json(item)
+        return self.read_bytes(path).decode()
+
+    def exists(self, path: Path) -> bool:
+        path = Path(path)
+        with self._cond:
+            item = self._lookup(path)
+            if item is not None and not isinstance(item, list):
+                return True
+        return path.exists()
+
+    def pending(self, path: Path) -> bool:
+        """Whether a write of path is queued or in progress"""
+        with self._cond:
+            return self._lookup(Path(path)) is not None
+
+    def wait(self, path: Path, timeout: Optional[float] = None) -> bool:
+        """Wait until the queued writes of one path are on disk"""
+        path = Path(path)
+        with self._cond:
+            return self._cond.wait_for(lambda: self._lookup(path) is None, timeout)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued write is on disk"""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._inflight, timeout
+            )
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                path, item = self._pending.popitem(last=False)
+                on_written = self._on_written.pop(path, None)
+                self._inflight[path] = item
+            try:
+                self._write(path, item)
+                if on_written is not None:
+                    on_written()
+            except Exception as e:
+                logger.error("Failed to write %s: %s", path, e)
+            finally:
+                with self._cond:
+                    self._inflight.pop(path, None)
+                    self._cond.notify_all()
+
+    def _write(self, path: Path, item: Any):
+        if isinstance(item, list):
+            try:
+                data = json.loads(path.read_text())
+            except FileNotFoundError:
+                return
+            for update in item:
+                data = update(data)
+            item = data
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_name(f".{path.name}.tmp")
+        content = _dump_json(item) if isinstance(item, dict) else item
+        with open(tmp_file, "wb" if isinstance(content, bytes) else "w") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+
+
+def _dump_json(data: Dict) -> str:
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+# Shared by all services so reads see every queued write
+writer = PersistenceWriter()
@@ -10,6 +10,7 @@ class SettingsService:
         self.settings_file = settings_file or Path("data/settings.json")
         self.settings_file.parent.mkdir(parents=True, exist_ok=True)
         self._settings: Optional[Settings] = None
+        self._mtime: Optional[float] = None
         self._load_settings()
     
     def _load_settings(self) -> Settings:
@@ -19,6 +20,7 @@ class SettingsService:
                 with open(self.settings_file, 'r') as f:
                     data = json.load(f)
                     self._settings = Settings(**data)
+                self._mtime = self.settings_file.stat().st_mtime
             except (json.JSONDecodeError, ValueError) as e:
                 print(f"Error loading settings: {e}. Using defaults.")
                 self._settings = Settings()
@@ -33,10 +35,18 @@ class SettingsService:
         """Save current settings to file"""
         with open(self.settings_file, 'w') as f:
             json.dump(self._settings.model_dump(), f, indent=2)
+        self._mtime = self.settings_file.stat().st_mtime
+    
+    def _file_changed(self) -> bool:
+        """Check whether another service instance wrote the settings file"""
+        try:
+            return self.settings_file.stat().st_mtime != self._mtime
+        except FileNotFoundError:
+            return False
     
     def get_settings(self) -> Settings:
         """Get current settings"""
-        if self._settings is None:
+        if self._settings is None or self._file_changed():
             self._load_settings()
         return self._settings
     
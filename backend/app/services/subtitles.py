@@ -0,0 +1,388 @@
+import html
+import json
+import math
+import re
+import xml.etree.ElementTree as ET
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class Cue(NamedTuple):
+    start: float  # seconds
+    end: float  # seconds
+    text: str  # cue lines joined with "\n", markup removed
+    # Leading lines repeated from earlier cues in rolling auto-captions, where
+    # only the newly spoken line carries word timings; None when the source
+    # has no word timings to tell
+    carried: Optional[int] = None
+
+
+# A timing line, 00:01:02.345 --> 00:01:04.000 (VTT, hours optional) or
+# 00:01:02,345 --> 00:01:04,000 (SRT), and the cue text lines up to the
+# next blank line
+_CUE_RE = re.compile(
+    r"^[ \t]*([\d:.,]+)[ \t]*-->[ \t]*([\d:.,]+)[^\n]*"
+    r"(?:\n([^\n]+(?:\n[^\n]+)*))?",
+    re.MULTILINE,
+)
+# Tags never span lines, so a literal "<" in cue text stays where it is
+_TAG_RE = re.compile(r"<[^>\n]*>")
+# Word timing tag of YouTube auto-captions, <00:01:02.345>
+_WORD_TIMING_RE = re.compile(r"<(?:\d+:)?\d{2}:\d{2}\.\d{3}>")
+
+
+def _seconds(timestamp: str) -> Optional[float]:
+    """[hh:]mm:ss.mmm (or ss,mmm) in seconds; None if malformed"""
+    parts = timestamp.replace(",", ".").split(":")
+    if not 2 <= len(parts) <= 3:
+        return None
+    try:
+        value = int(parts[-2]) * 60 + float(parts[-1])
+        if len(parts) == 3:
+            value += int(parts[0]) * 3600
+    except ValueError:
+        return None
+    return value
+
+
+def parse_timed_text(content: str) -> List[Cue]:
+    """Parse VTT or SRT content into cues in a single pass.
+
+    One regex scan yields each timing line with the text block below it,
+    so headers, NOTE/STYLE blocks and SRT cue numbers are never looked
+    at. Markup is stripped per cue; timestamps repeat (one cue ends where
+    the next starts), so each is converted once.
+
+    In documents with word timings, each cue records how many of its
+    leading lines have none (Cue.carried) before the tags are stripped.
+    """
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+
+    cues = []
+    append = cues.append
+    strip_tags = _TAG_RE.sub
+    word_timing = _WORD_TIMING_RE.search
+    has_word_timing = word_timing(content) is not None
+    seconds: Dict[str, Optional[float]] = {}
+
+    for start, end, text in _CUE_RE.findall(content):
+        if not text:
+            continue
+        carried = None
+        if has_word_timing:
+            match = word_timing(text)
+            if match:
+                # Non-blank lines above the first timed one
+                above = text[: match.start()].split("\n")[:-1]
+                carried = sum(1 for line in above if line.strip())
+        if "<" in text:
+            text = strip_tags("", text)
+        if "&" in text:
+            text = html.unescape(text)
+        if "\n" in text:
+            text = "\n".join(filter(None, map(str.strip, text.split("\n"))))
+        else:
+            text = text.strip()
+        if not text:
+            continue
+
+        start_seconds = seconds.get(start)
+        if start_seconds is None:
+            start_seconds = seconds[start] = _seconds(start)
+        end_seconds = seconds.get(end)
+        if end_seconds is None:
+            end_seconds = seconds[end] = _seconds(end)
+        if start_seconds is not None and end_seconds is not None:
+            if has_word_timing and carried is None:
+                # No timed line: the whole cue repeats earlier ones
+                carried = text.count("\n") + 1
+            append(Cue(start_seconds, end_seconds, text, carried))
+
+    return cues
+
+
+def parse_json3(content: str) -> List[Cue]:
+    """Parse YouTube's json3 caption format"""
+    cues = []
+    for event in json.loads(content).get("events", []):
+        segs = event.get("segs")
+        if not segs:
+            continue
+        text = "".join(seg.get("utf8", "") for seg in segs)
+        lines = [line.strip() for line in text.split("\n")]
+        text = "\n".join(line for line in lines if line)
+        if text:
+            start = event.get("tStartMs", 0) / 1000
+            end = start + event.get("dDurationMs", 0) / 1000
+            cues.append(Cue(start, end, text))
+    return cues
+
+
+def parse_srv3(content: str) -> List[Cue]:
+    """Parse YouTube's srv3 (timedtext XML) caption format"""
+    cues = []
+    root = ET.fromstring(content)
+    for p in root.iter("p"):
+        lines = [line.strip() for line in "".join(p.itertext()).split("\n")]
+        text = "\n".join(line for line in lines if line)
+        if text:
+            start = int(p.get("t", 0)) / 1000
+            end = start + int(p.get("d", 0)) / 1000
+            cues.append(Cue(start, end, text))
+    return cues
+
+
+def parse_subtitles(content: str, fmt: Optional[str] = None) -> List[Cue]:
+    """Parse subtitle content, detecting the format when fmt is not given"""
+    if fmt is None:
+        head = content.lstrip()[:1]
+        fmt = "json3" if head == "{" else "srv3" if head == "<" else "vtt"
+
+    if fmt == "json3":
+        return parse_json3(content)
+    if fmt == "srv3":
+        return parse_srv3(content)
+    if fmt in ("vtt", "srt"):
+        return parse_timed_text(content)
+    raise ValueError(f"Unsupported subtitle format: {fmt}")
+
+
+def _merge_overlap(previous: str, line: str, max_words: int) -> Optional[str]:
+    """Return the part of line that is not a repeat of previous's tail.
+
+    Rolling captions often restate the last words of the previous line;
+    only overlaps of at least two words are treated as repeats.
+    """
+    # Cheap rejection: an overlap must start with line's first word
+    if line.partition(" ")[0] not in previous:
+        return None
+    prev_words = previous.split()[-max_words:]
+    words = line.split()
+    for size in range(min(len(prev_words), len(words) - 1), 1, -1):
+        if prev_words[-size:] == words[:size]:
+            return " ".join(words[size:])
+    return None
+
+
+def dedupe_cues(
+    cues: Iterable[Cue], window: int = 2, max_overlap_words: int = 16
+) -> Iterator[Cue]:
+    """Collapse rolling auto-caption repeats into one cue per new line.
+
+    YouTube auto-captions restate the previous line at the top of each cue
+    and show a finished line once more on its own. Only such carried-over
+    lines are dropped, and only while they are among the last `window`
+    lines, so memory is constant and a line that is really said again
+    (back to back or later in the video) is kept. Cue.carried tells which
+    lines are carried over; without word timings it is every line with a
+    newer one below it, and lines that grow word by word or echo the tail
+    of the last line are merged as well.
+    """
+    recent = deque(maxlen=window)  # lines shown most recently
+    pending = None  # output cue for the current line, held until it stops growing
+    last_line = ""  # full text of that line as it appeared in the captions
+
+    for cue in cues:
+        lines = cue.text.split("\n")
+        timed = cue.carried is not None
+        carried = cue.carried if timed else len(lines) - 1
+        for index, line in enumerate(lines):
+            if index < carried and line in recent:
+                continue
+            recent.append(line)
+
+            if pending is not None:
+                grown = line[len(last_line) :]
+                if not timed and line.startswith(last_line) and grown[:1] == " ":
+                    # The previous line grew; extend it instead of repeating it
+                    pending = Cue(pending.start, cue.end, pending.text + grown)
+                    last_line = line
+                    continue
+                yield pending
+                if timed:
+                    text = line
+                else:
+                    text = _merge_overlap(last_line, line, max_overlap_words) or line
+            else:
+                text = line
+
+            pending = Cue(cue.start, cue.end, text)
+            last_line = line
+
+    if pending is not None:
+        yield pending
+
+
+def cues_to_text(cues: Iterable[Cue]) -> str:
+    """Join cue lines into plain text"""
+    return "\n".join(cue.text for cue in cues)
+
+
+_SENTENCE_END = ".!?:;"
+
+
+def _ends_sentence(text: str) -> bool:
+    return text[-1:] in _SENTENCE_END
+
+
+def _segment(
+    items: Iterable[Tuple[str, float]], min_chars: int, max_chars: int, pause: float
+) -> Iterator[str]:
+    """Group (text, gap before it) items into paragraphs, lazily.
+
+    A paragraph closes at a pause or sentence end once it holds min_chars,
+    and always at an infinite gap (a blank line in untimed text).
+    When it would grow past max_chars it is split at the longest noticeable
+    pause after min_chars, or closed as is when there is none, until the
+    next text fits; this keeps chunks balanced even for unpunctuated
+    auto-captions. Only a single text longer than max_chars exceeds it.
+    """
+    texts: List[str] = []
+    gaps: List[float] = []
+    length = 0
+
+    for text, gap in items:
+        if texts and (
+            gap == math.inf
+            or (length >= min_chars and (gap >= pause or _ends_sentence(texts[-1])))
+        ):
+            yield " ".join(texts)
+            texts, gaps, length = [], [], 0
+        # What is left after a split may still not fit, so check again
+        while texts and length + 1 + len(text) > max_chars:
+            split_at, best_gap, prefix = len(texts), pause / 4, 0
+            for i in range(1, len(texts)):
+                prefix += len(texts[i - 1]) + 1
+                if prefix >= min_chars and gaps[i] > best_gap:
+                    split_at, best_gap = i, gaps[i]
+            yield " ".join(texts[:split_at])
+            texts, gaps = texts[split_at:], gaps[split_at:]
+            length = sum(len(t) + 1 for t in texts)
+        texts.append(text)
+        gaps.append(gap)
+        length += len(text) + 1
+
+    if texts:
+        yield " ".join(texts)
+
+
+def segment_cues(
+    cues: Iterable[Cue], min_chars: int, max_chars: int, pause: float
+) -> List[str]:
+    """Split timed cues into paragraphs using the pauses between them"""
+
+    def items():
+        previous_end = None
+        for cue in cues:
+            gap = cue.start - previous_end if previous_end is not None else 0.0
+            previous_end = cue.end
+            for line in cue.text.split("\n"):
+                yield line, gap
+                gap = 0.0
+
+    return list(_segment(items(), min_chars, max_chars, pause))
+
+
+def segment_text(text: str, min_chars: int, max_chars: int) -> List[str]:
+    """Split plain subtitle-style lines into paragraphs.
+
+    Without timings, blank lines are the only pauses.
+    """
+    return list(iter_text_segments(text.split("\n"), min_chars, max_chars))
+
+
+def iter_text_segments(
+    lines: Iterable[str], min_chars: int, max_chars: int
+) -> Iterator[str]:
+    """segment_text over an iterable of lines (e.g. an open file), lazily"""
+
+    def items():
+        gap = 0.0
+        for line in lines:
+            line = line.strip()
+            if not line:
+                gap = math.inf
+                continue
+            yield line, gap
+            gap = 0.0
+
+    return _segment(items(), min_chars, max_chars, math.inf)
+
+
+def split_long_text(text: str, max_chars: int) -> Iterator[str]:
+    """Split text into pieces of at most max_chars characters.
+
+    A piece ends at the last sentence end that fits (unless that leaves it
+    under half of max_chars), else at the last space; only text without
+    either is cut mid-word.
+    """
+    while len(text) > max_chars:
+        window = text[: max_chars + 1]
+        cut = max(window.rfind(f"{end} ") for end in _SENTENCE_END) + 1
+        if cut < max_chars // 2:
+            cut = window.rfind(" ")
+        if cut <= 0:
+            cut = max_chars
+        yield text[:cut].rstrip()
+        text = text[cut:].lstrip()
+    if text:
+        yield text
+
+
+def iter_chunks(paragraphs: Iterable[str], max_chars: int) -> Iterator[str]:
+    """Group paragraphs into chunks of at most max_chars characters, lazily.
+
+    Paragraphs longer than max_chars are split with split_long_text.
+    """
+    chunk: List[str] = []
+    length = 0
+    for paragraph in paragraphs:
+        for piece in split_long_text(paragraph, max_chars):
+            if chunk and length + 2 + len(piece) > max_chars:
+                yield "\n\n".join(chunk)
+                chunk, length = [], 0
+            chunk.append(piece)
+            length += len(piece) + 2
+    if chunk:
+        yield "\n\n".join(chunk)
+
+
+def dump_cues(cues: Iterable[Cue]) -> str:
+    """Serialize cues as a compact JSON array of [start, end, text]"""
+    return json.dumps(
+        [[round(c.start, 3), round(c.end, 3), c.text] for c in cues],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def load_cues(content: str) -> List[Cue]:
+    return [Cue(start, end, text) for start, end, text in json.loads(content)]
+
+
+def _timestamp(seconds: float, separator: str) -> str:
+    ms = round(seconds * 1000)
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    secs, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{ms:03d}"
+
+
+def dump_subtitles(cues: Iterable[Cue], fmt: str) -> str:
+    """Write cues as an SRT or VTT document"""
+    if fmt not in ("srt", "vtt"):
+        raise ValueError(f"Unsupported subtitle format: {fmt}")
+
+    separator = "," if fmt == "srt" else "."
+    blocks = ["WEBVTT\n"] if fmt == "vtt" else []
+    for i, cue in enumerate(cues, 1):
+        timing = (
+            f"{_timestamp(cue.start, separator)} --> {_timestamp(cue.end, separator)}"
+        )
+        # A blank line would end the cue early
+        text = "\n".join(filter(None, map(str.strip, cue.text.split("\n"))))
+        if fmt == "srt":
+            timing = f"{i}\n{timing}"
+        blocks.append(f"{timing}\n{text}\n")
+    return "\n".join(blocks)
@@ -1,17 +1,21 @@
 import logging
 import httpx
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 import asyncio
 from app.config import settings
+from app.services.cache import TranslationCache
+from app.services.subtitles import segment_text
 
 logger = logging.getLogger(__name__)
 
 
 class TranslationService:
-    def __init__(self):
+    def __init__(self, cache: Optional[TranslationCache] = None):
         self.libretranslate_url = settings.LIBRETRANSLATE_URL
         self.api_key = settings.LIBRETRANSLATE_API_KEY
         self.chunk_size = settings.CHUNK_SIZE
+        # Optional; reuses earlier translations of identical chunks and cues
+        self.cache = cache
 
     async def translate(
         self,
@@ -32,6 +36,66 @@ class TranslationService:
         else:
             raise ValueError(f"Unsupported provider: {provider}")
 
+    async def translate_batch(
+        self,
+        texts: List[str],
+        source_lang: str = "auto",
+        target_lang: str = "en",
+        provider: str = "libretranslate",
+    ) -> List[str]:
+        """Translate many short texts (e.g. subtitle cues) in few requests.
+
+        Texts are packed into requests of up to CHUNK_SIZE characters using
+        LibreTranslate's list form of q, and returned in input order.
+        """
+        if provider != "libretranslate":
+            raise ValueError(f"Unsupported provider: {provider}")
+
+        translated: List[Optional[str]] = [
+            self.cache.get(text, source_lang, target_lang, provider)
+            if self.cache
+            else None
+            for text in texts
+        ]
+        missing = [i for i, text in enumerate(translated) if text is None]
+        batches = self._pack([texts[i] for i in missing])
+        logger.info(
+            "Translating %d texts in %d request(s) from '%s' to '%s'",
+            len(missing),
+            len(batches),
+            source_lang,
+            target_lang,
+        )
+        position = 0
+        for batch in batches:
+            result = await self._call_libretranslate(batch, source_lang, target_lang)
+            output = result["translatedText"]
+            if not isinstance(output, list) or len(output) != len(batch):
+                raise Exception(
+                    f"LibreTranslate returned {len(output)} translations "
+                    f"for {len(batch)} texts"
+                )
+            for text, translation in zip(batch, output):
+                translated[missing[position]] = translation
+                position += 1
+                if self.cache:
+                    self.cache.set(text, source_lang, target_lang, provider, translation)
+        return translated
+
+    def _pack(self, texts: List[str]) -> List[List[str]]:
+        batches: List[List[str]] = []
+        batch: List[str] = []
+        length = 0
+        for text in texts:
+            if batch and length + len(text) > self.chunk_size:
+                batches.append(batch)
+                batch, length = [], 0
+            batch.append(text)
+            length += len(text)
+        if batch:
+            batches.append(batch)
+        return batches
+
     async def _translate_libretranslate(
         self, text: str, source_lang: str, target_lang: str
     ) -> Dict[str, Any]:
@@ -53,8 +117,14 @@ class TranslationService:
             return await self._call_libretranslate(text, source_lang, target_lang)
 
     async def _call_libretranslate(
-        self, text: str, source_lang: str, target_lang: str
+        self, text: Union[str, List[str]], source_lang: str, target_lang: str
     ) -> Dict[str, Any]:
+        cacheable = self.cache is not None and isinstance(text, str)
+        if cacheable:
+            cached = self.cache.get(text, source_lang, target_lang, "libretranslate")
+            if cached is not None:
+                return {"translatedText": cached}
+
         async with httpx.AsyncClient(timeout=30.0) as client:
             payload = {
                 "q": text,
@@ -76,7 +146,16 @@ class TranslationService:
                     source_lang,
                     target_lang,
                 )
-                return response.json()
+                result = response.json()
+                if cacheable:
+                    self.cache.set(
+                        text,
+                        source_lang,
+                        target_lang,
+                        "libretranslate",
+                        result["translatedText"],
+                    )
+                return result
             except httpx.HTTPStatusError as e:
                 logger.error("LibreTranslate HTTP error: %s", e.response.status_code)
                 raise Exception(f"LibreTranslate error: {e.response.status_code}")
@@ -130,26 +209,8 @@ class TranslationService:
         return chunks
 
     def prepare_text_for_translation(self, text: str) -> str:
-        lines = text.split("\n")
-        paragraphs = []
-        current_para = []
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                if current_para:
-                    paragraphs.append(" ".join(current_para))
-                    current_para = []
-            else:
-                if line and line[-1] in ".!?:;":
-                    current_para.append(line)
-                    if len(current_para) > 3:
-                        paragraphs.append(" ".join(current_para))
-                        current_para = []
-                else:
-                    current_para.append(line)
-
-        if current_para:
-            paragraphs.append(" ".join(current_para))
-
-        return "\n\n".join(paragraphs)
+        return "\n\n".join(
+            segment_text(
+                text, settings.PARAGRAPH_MIN_CHARS, settings.PARAGRAPH_MAX_CHARS
+            )
+        )
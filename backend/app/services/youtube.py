@@ -1,15 +1,42 @@
+import hashlib
 import logging
 import re
 import json
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 import asyncio
+import tempfile
 from app.config import settings
-from app.services.history import HistoryService
+from app.services.cache import TTLCache
+from app.services.cookies import CookieJarManager
+from app.services.persistence import writer
+from app.services.history import history_service
+from app.services.settings import SettingsService
+from app.services.subtitles import (
+    Cue,
+    cues_to_text,
+    dedupe_cues,
+    dump_cues,
+    load_cues,
+    parse_subtitles,
+    parse_timed_text,
+    segment_cues,
+)
 from app.services.translator import TranslationService
 
 logger = logging.getLogger(__name__)
 
+VIDEO_ID_RE = re.compile(r"[a-zA-Z0-9_-]{11}")
+LANG_RE = re.compile(r"[a-zA-Z0-9_-]{1,35}")
+
+# Texts that meta.json stores as "<field>_hash" references into the blob store
+META_TEXT_FIELDS = (
+    "source_transcript_raw",
+    "source_transcript_processed",
+    "target_transcript_raw",
+    "target_transcript_processed",
+)
+
 
 class YouTubeTranscriptService:
     def __init__(self):
@@ -17,8 +44,17 @@ class YouTubeTranscriptService:
         self.transcript_dir.mkdir(exist_ok=True)
         self.temp_dir = self.transcript_dir / "temp"
         self.temp_dir.mkdir(exist_ok=True)
-        self.history_service = HistoryService()
+        self.history_service = history_service
+        self.blob_store = self.history_service.blob_store
         self.translation_service = TranslationService()
+        self.settings_service = SettingsService()
+        self.metadata_cache = TTLCache(
+            settings.DATA_DIR / "metadata_cache.json", max_age=settings.CACHE_TTL
+        )
+        # (video_id, language) combinations known to have no subtitles
+        self.missing_subtitles = TTLCache(max_age=settings.NEGATIVE_CACHE_TTL)
+        self.cookie_jar = CookieJarManager()
+        self._file_hashes: Dict[Path, Tuple[Tuple[int, int, int], str]] = {}
 
     def extract_video_id(self, url: str) -> Optional[str]:
         """Extract video ID from YouTube URL"""
@@ -36,178 +72,270 @@ class YouTubeTranscriptService:
 
         return None
 
-    async def get_video_info(self, url: str, use_cookies: str = "none") -> Dict:
-        """Get video title and metadata using yt-dlp"""
-        cmd = ["yt-dlp", "--dump-json", "--no-warnings", url]
+    def _metadata_ttl(self) -> int:
+        """Seconds a metadata cache entry stays valid.
 
-        if use_cookies != "none":
-            cmd.extend(["--cookies-from-browser", use_cookies])
+        The user's cache_duration_minutes setting applies, capped by the
+        server-wide CACHE_TTL.
+        """
+        user_minutes = self.settings_service.get_settings().cache_duration_minutes
+        return min(settings.CACHE_TTL, user_minutes * 60)
 
-        try:
-            result = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    async def run_ytdlp(
+        self,
+        cmd: List[str],
+        use_cookies: str = "none",
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, bytes, bytes]:
+        """Run yt-dlp with the cookie file for use_cookies.
+
+        If YouTube rejects the exported cookies, they are exported again
+        from the browser and the command is retried once.
+        """
+        async with self.cookie_jar.get_args(use_cookies) as cookie_args:
+            result = await self._exec_ytdlp(
+                [cmd[0], *cookie_args, *cmd[1:]], timeout
             )
-            stdout, stderr = await result.communicate()
+            retry = (
+                result[0] != 0
+                and cookie_args[:1] == ["--cookies"]
+                and self.cookie_jar.is_auth_failure(result[2])
+            )
+
+        if retry:
+            logger.info("yt-dlp rejected %s cookies, exporting again", use_cookies)
+            async with self.cookie_jar.get_args(
+                use_cookies, refresh=True
+            ) as cookie_args:
+                result = await self._exec_ytdlp(
+                    [cmd[0], *cookie_args, *cmd[1:]], timeout
+                )
+
+        return result
 
-            if result.returncode == 0 and stdout:
+    async def _exec_ytdlp(
+        self, cmd: List[str], timeout: Optional[float] = None
+    ) -> Tuple[int, bytes, bytes]:
+        """Run yt-dlp and collect its output.
+
+        The process is killed when the deadline (YTDLP_TIMEOUT by default)
+        passes or when the awaiting request is cancelled, so abandoned
+        extractions do not keep running.
+        """
+        timeout = timeout or settings.YTDLP_TIMEOUT
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            if isinstance(e, asyncio.TimeoutError):
+                logger.warning("yt-dlp timed out after %ss: %s", timeout, cmd[-1])
+                raise asyncio.TimeoutError(f"yt-dlp timed out after {timeout}s")
+            logger.info("yt-dlp cancelled: %s", cmd[-1])
+            raise
+        return process.returncode, stdout, stderr
+
+    async def get_video_metadata(self, url: str, use_cookies: str = "none") -> Dict:
+        """Get video info and subtitle track listings with a single yt-dlp run.
+
+        Results are cached per video ID so that the info dialog, the fetch
+        and later refetches share one extraction.
+        """
+        video_id = self.extract_video_id(url)
+        if video_id:
+            cached = self.metadata_cache.get(video_id, self._metadata_ttl())
+            if cached:
+                logger.info("Using cached metadata for video %s", video_id)
+                return cached
+
+        cmd = ["yt-dlp", "--dump-json", "--no-playlist", "--no-warnings", url]
+
+        try:
+            returncode, stdout, stderr = await self.run_ytdlp(cmd, use_cookies)
+
+            if returncode == 0 and stdout:
                 data = json.loads(stdout.decode())
-                return {
-                    "title": data.get("title", ""),
-                    "duration": data.get("duration", 0),
-                    "uploader": data.get("uploader", ""),
-                    "upload_date": data.get("upload_date", ""),
-                    "description": data.get("description", "")[:500],
+                manual = [
+                    lang for lang in (data.get("subtitles") or {}) if lang != "live_chat"
+                ]
+                automatic = list(data.get("automatic_captions") or {})
+                metadata = {
+                    "video_info": {
+                        "title": data.get("title", ""),
+                        "duration": data.get("duration", 0),
+                        "uploader": data.get("uploader", ""),
+                        "upload_date": data.get("upload_date", ""),
+                        "description": (data.get("description") or "")[:500],
+                    },
+                    "available_languages": list(dict.fromkeys(manual + automatic)),
+                    "manual_languages": manual,
                 }
+                if video_id:
+                    self.metadata_cache.set(video_id, metadata)
+                return metadata
+        except asyncio.TimeoutError:
+            raise
         except Exception as e:
-            logger.error("Error getting video info: %s", e)
+            logger.error("Error getting video metadata: %s", e)
 
         return {}
 
+    async def get_video_info(self, url: str, use_cookies: str = "none") -> Dict:
+        """Get video title and metadata using yt-dlp"""
+        metadata = await self.get_video_metadata(url, use_cookies)
+        return metadata.get("video_info", {})
+
     async def check_available_subtitles(
         self, url: str, use_cookies: str = "none"
     ) -> List[str]:
         """Check available subtitles for the video"""
-        cmd = ["yt-dlp", "--list-subs", "--no-warnings", url]
-
-        if use_cookies != "none":
-            cmd.extend(["--cookies-from-browser", use_cookies])
-
-        try:
-            result = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await result.communicate()
-
-            if result.returncode == 0 and stdout:
-                available = []
-                lines = stdout.decode().split("\n")
-                in_subtitles = False
-
-                for line in lines:
-                    if (
-                        "Available automatic captions" in line
-                        or "Available subtitles" in line
-                    ):
-                        in_subtitles = True
-                        continue
-                    if in_subtitles and line.strip():
-                        parts = line.split()
-                        if parts and not line.startswith("Language"):
-                            lang_code = parts[0]
-                            available.append(lang_code)
-
-                return available
-        except Exception as e:
-            logger.error("Error checking subtitles: %s", e)
-
-        return []
+        metadata = await self.get_video_metadata(url, use_cookies)
+        return metadata.get("available_languages", [])
 
     async def fetch_transcript(
         self,
         url: str,
         language: str = "en",
         use_cookies: str = "none",
-        auto_translate: bool = True,
     ) -> Optional[str]:
         """Fetch transcript for a specific language"""
-        # Clean temp directory
-        for f in self.temp_dir.glob("*"):
-            f.unlink()
-
-        # Build yt-dlp command
-        cmd = [
-            "yt-dlp",
-            "--write-sub",
-            "--write-auto-sub",
-            "--sub-lang",
-            language,
-            "--skip-download",
-            "--sub-format",
-            "vtt",
-            "-o",
-            str(self.temp_dir / "transcript"),
-        ]
-
-        if use_cookies != "none":
-            cmd.extend(["--cookies-from-browser", use_cookies])
-
-        cmd.append(url)
-
-        try:
-            result = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await result.communicate()
-
-            # Find VTT file
-            vtt_files = list(self.temp_dir.glob(f"*.{language}.vtt"))
-            if not vtt_files:
-                vtt_files = list(self.temp_dir.glob("*.vtt"))
+        transcripts = await self.fetch_transcripts(url, [language], use_cookies)
+        cues = transcripts.get(language)
+        return cues_to_text(cues) if cues else None
+
+    async def fetch_transcripts(
+        self, url: str, languages: List[str], use_cookies: str = "none"
+    ) -> Dict[str, List[Cue]]:
+        """Fetch transcripts for several languages in a single yt-dlp run.
+
+        Returns a mapping of language code to timed cues for every
+        requested language that YouTube provided.
+        """
+        transcripts = {}
+
+        with tempfile.TemporaryDirectory(dir=self.temp_dir) as temp_dir:
+            # Build yt-dlp command
+            cmd = [
+                "yt-dlp",
+                "--write-sub",
+                "--write-auto-sub",
+                "--sub-lang",
+                ",".join(languages),
+                "--skip-download",
+                "--no-playlist",
+                "--sub-format",
+                "vtt",
+                "-o",
+                str(Path(temp_dir) / "transcript"),
+            ]
+
+            cmd.append(url)
 
-            if vtt_files:
-                vtt_content = vtt_files[0].read_text()
-                return self.clean_vtt(vtt_content)
-        except Exception as e:
-            logger.error("Error fetching transcript: %s", e)
+            try:
+                await self.run_ytdlp(cmd, use_cookies)
+
+                # Files are named transcript.{lang}.{format}
+                for sub_file in Path(temp_dir).glob("transcript.*.*"):
+                    lang, fmt = sub_file.name[len("transcript.") :].rsplit(".", 1)
+                    if lang in languages:
+                        cues = list(
+                            dedupe_cues(parse_subtitles(sub_file.read_text(), fmt))
+                        )
+                        if cues:
+                            transcripts[lang] = cues
+            except asyncio.TimeoutError:
+                raise
+            except Exception as e:
+                logger.error("Error fetching transcript: %s", e)
 
-        return None
+        return transcripts
 
     def clean_vtt(self, vtt_content: str) -> str:
         """Clean VTT subtitle content to plain text"""
-        lines = vtt_content.split("\n")
-        clean_lines = []
-        seen = set()
-
-        for line in lines:
-            line = line.strip()
-            # Skip metadata, timestamps, and empty lines
-            if not line:
-                continue
-            if line == "WEBVTT":
-                continue
-            if line.startswith("Kind:") or line.startswith("Language:"):
-                continue
-            if "-->" in line:
-                continue
-            if re.match(r"^\d+$", line):
-                continue
-            if re.match(r"^\d{2}:\d{2}", line):
-                continue
-            # Remove HTML tags
-            line = re.sub(r"<[^>]+>", "", line)
-
-            # Remove duplicate lines (common in auto-subs)
-            if line and line not in seen:
-                seen.add(line)
-                clean_lines.append(line)
-
-        return "\n".join(clean_lines)
+        return cues_to_text(dedupe_cues(parse_timed_text(vtt_content)))
 
     def prepare_text_for_translation(self, text: str) -> str:
         """Merge subtitle lines into readable paragraphs"""
-        lines = text.split("\n")
-        paragraphs = []
-        current_para = []
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                if current_para:
-                    paragraphs.append(" ".join(current_para))
-                    current_para = []
-            else:
-                if line and line[-1] in ".!?:;":
-                    current_para.append(line)
-                    if len(current_para) > 3:
-                        paragraphs.append(" ".join(current_para))
-                        current_para = []
-                else:
-                    current_para.append(line)
+        return self.translation_service.prepare_text_for_translation(text)
+
+    def prepare_cues_for_translation(self, cues: List[Cue]) -> str:
+        """Merge timed cues into paragraphs, breaking at pauses in speech"""
+        return "\n\n".join(
+            segment_cues(
+                cues,
+                settings.PARAGRAPH_MIN_CHARS,
+                settings.PARAGRAPH_MAX_CHARS,
+                settings.PARAGRAPH_PAUSE_SECONDS,
+            )
+        )
+
+    def _paragraphs_file(
+        self, video_id: str, lang: str, source_lang: Optional[str] = None
+    ) -> Path:
+        """Paragraph form of a transcript, or of its translation from source_lang.
+
+        A video can have one record per source language, each translated
+        into the same target, so translations are keyed by both languages.
+        """
+        if source_lang:
+            name = f"translation_paragraphs_{source_lang}_{lang}.txt"
+        else:
+            name = f"paragraphs_{lang}.txt"
+        return self.transcript_dir / video_id / name
+
+    def _write_text_file(self, path: Path, text: str) -> str:
+        """Store text in the blob store and write a copy to path; returns its hash"""
+        digest = self.blob_store.put(text)
+        writer.write_text(path, text)
+        return digest
+
+    def save_processed_transcript(
+        self,
+        video_id: str,
+        lang: str,
+        processed: str,
+        source_lang: Optional[str] = None,
+    ):
+        """Store the paragraph form next to the raw transcript or translation.
 
-        if current_para:
-            paragraphs.append(" ".join(current_para))
+        source_lang marks processed as the translation from that language.
+        """
+        self._write_text_file(
+            self._paragraphs_file(video_id, lang, source_lang), processed
+        )
 
-        return "\n\n".join(paragraphs)
+    def load_processed_transcript(
+        self,
+        video_id: str,
+        lang: str,
+        text: str,
+        source_lang: Optional[str] = None,
+    ) -> str:
+        """Get the paragraph form of a stored transcript or translation.
+
+        Normally a single file read. Entries stored before paragraphs were
+        persisted are processed once, from their cues when available so
+        timing gaps are used, and the result is written back.
+        """
+        paragraphs_file = self._paragraphs_file(video_id, lang, source_lang)
+        try:
+            return writer.read_text(paragraphs_file)
+        except FileNotFoundError:
+            pass
+
+        cues_file = self.transcript_dir / video_id / f"cues_{lang}.json"
+        if not source_lang and writer.exists(cues_file):
+            processed = self.prepare_cues_for_translation(
+                load_cues(writer.read_text(cues_file))
+            )
+        else:
+            processed = self.prepare_text_for_translation(text)
+        self.save_processed_transcript(video_id, lang, processed, source_lang)
+        return processed
 
     async def fetch_and_save_transcript(
         self,
@@ -216,8 +344,18 @@ class YouTubeTranscriptService:
         target_lang: Optional[str] = None,
         use_cookies: str = "none",
         merge_lines: bool = True,
+        prefetch_langs: Optional[List[str]] = None,
+        prefetch_all_manual: Optional[bool] = None,
+        prefer_youtube_translation: Optional[bool] = None,
     ) -> Dict:
-        """Fetch transcript and translate via LibreTranslate"""
+        """Fetch transcript and translate via LibreTranslate
+
+        prefetch_langs and prefetch_all_manual default to the
+        SUBTITLE_PREFETCH_LANGS and SUBTITLE_PREFETCH_ALL_MANUAL settings.
+        With prefer_youtube_translation (default PREFER_YOUTUBE_TRANSLATION)
+        YouTube's own target-language caption track is downloaded in the same
+        run and LibreTranslate is only used when that track is missing.
+        """
         video_id = self.extract_video_id(url)
         if not video_id:
             raise ValueError("Invalid YouTube URL")
@@ -244,8 +382,8 @@ class YouTubeTranscriptService:
                 "available_languages": cached_transcript["available_languages"],
                 "source_lang": source_lang,
                 "source_transcript_raw": cached_transcript["original_text"],
-                "source_transcript_processed": self.prepare_text_for_translation(
-                    cached_transcript["original_text"]
+                "source_transcript_processed": self.load_processed_transcript(
+                    video_id, source_lang, cached_transcript["original_text"]
                 )
                 if merge_lines
                 else None,
@@ -253,52 +391,181 @@ class YouTubeTranscriptService:
                 "target_transcript_raw": cached_transcript["translated_text"]
                 if cached_transcript["translated_text"]
                 else None,
-                "target_transcript_processed": self.prepare_text_for_translation(
-                    cached_transcript["translated_text"]
+                "target_transcript_processed": self.load_processed_transcript(
+                    video_id,
+                    target_lang,
+                    cached_transcript["translated_text"],
+                    source_lang=source_lang,
                 )
                 if cached_transcript["translated_text"] and merge_lines
                 else None,
                 "cached": True,
                 "entry_id": cached_transcript["entry_id"],
                 "translation_error": None,
+                "translation_provider": cached_transcript["provider"]
+                if cached_transcript["translated_text"]
+                else None,
                 "folder_path": video_id,
             }
             return result
 
-        # Get video info
-        video_info = await self.get_video_info(url, use_cookies)
-        title = video_info.get("title", video_id)
-        logger.info("Video title: %s", title)
-
-        # Check available subtitles
-        available_subs = await self.check_available_subtitles(url, use_cookies)
-        logger.info(
-            "Available subtitles: %s", available_subs[:10] if available_subs else "none"
+        if prefer_youtube_translation is None:
+            prefer_youtube_translation = settings.PREFER_YOUTUBE_TRANSLATION
+        wants_translation = bool(target_lang and target_lang != source_lang)
+        youtube_translation = None
+        youtube_translation_processed = None
+        source_cues = None
+
+        # The raw source transcript does not depend on the target language,
+        # so any earlier entry for this video and source language can be reused
+        cached_source = self.history_service.get_youtube_transcript(
+            video_id, source_lang
         )
 
-        # Fetch source language transcript
-        source_transcript_raw = await self.fetch_transcript(
-            url, source_lang, use_cookies
-        )
-        if not source_transcript_raw:
-            raise ValueError(f"Could not fetch transcript for language '{source_lang}'")
+        source_cached = bool(cached_source and cached_source["original_text"])
 
-        logger.info("Fetched source transcript: %d chars", len(source_transcript_raw))
+        if source_cached:
+            logger.info(
+                "Reusing cached %s transcript for video %s", source_lang, video_id
+            )
+            video_info = cached_source["video_info"]
+            title = cached_source["title"] or video_id
+            available_subs = cached_source["available_languages"]
+            source_transcript_raw = cached_source["original_text"]
+
+            # A target-language track ingested earlier is YouTube's own caption;
+            # otherwise download just that track, which is still far cheaper
+            # than running LibreTranslate over the whole transcript
+            if prefer_youtube_translation and wants_translation:
+                cached_target = self.history_service.get_youtube_transcript(
+                    video_id, target_lang
+                )
+                if cached_target and cached_target["original_text"]:
+                    youtube_translation = cached_target["original_text"]
+                    youtube_translation_processed = self.load_processed_transcript(
+                        video_id, target_lang, youtube_translation
+                    )
+                elif self._youtube_track_available(
+                    video_id, target_lang, available_subs
+                ):
+                    transcripts = await self.fetch_transcripts(
+                        url, [target_lang], use_cookies
+                    )
+                    target_cues = transcripts.get(target_lang)
+                    if target_cues:
+                        self._save_prefetched_transcript(
+                            video_id,
+                            title,
+                            url,
+                            target_lang,
+                            target_cues,
+                            available_subs,
+                            video_info,
+                        )
+                        youtube_translation = cues_to_text(target_cues)
+                        youtube_translation_processed = self.load_processed_transcript(
+                            video_id, target_lang, youtube_translation
+                        )
+                    else:
+                        self._mark_missing_track(video_id, target_lang)
+        else:
+            missing_reason = self.missing_subtitles.get(
+                f"{video_id}:{source_lang}", settings.NEGATIVE_CACHE_TTL
+            )
+            if missing_reason:
+                logger.info("Rejecting %s/%s from negative cache", video_id, source_lang)
+                raise ValueError(missing_reason)
+
+            # Get video info and available subtitles (cached per video)
+            metadata = await self.get_video_metadata(url, use_cookies)
+            video_info = metadata.get("video_info", {})
+            title = video_info.get("title") or video_id
+            logger.info("Video title: %s", title)
+
+            available_subs = metadata.get("available_languages", [])
+            logger.info(
+                "Available subtitles: %s",
+                available_subs[:10] if available_subs else "none",
+            )
 
-        # Process transcript if requested
+            if available_subs and source_lang not in available_subs:
+                self._reject_missing_language(
+                    video_id,
+                    source_lang,
+                    f"No subtitles available for language '{source_lang}'",
+                )
+
+            # Fetch the source transcript, plus any prefetch languages, in one run
+            extra_langs = self._prefetch_languages(
+                video_id, source_lang, metadata, prefetch_langs, prefetch_all_manual
+            )
+            languages = [source_lang] + extra_langs
+
+            # YouTube serves machine-translated caption tracks for most
+            # languages, which is far cheaper than running LibreTranslate
+            youtube_target = (
+                prefer_youtube_translation
+                and wants_translation
+                and self._youtube_track_available(video_id, target_lang, available_subs)
+            )
+            if youtube_target and target_lang not in languages:
+                languages.append(target_lang)
+
+            transcripts = await self.fetch_transcripts(url, languages, use_cookies)
+            source_cues = transcripts.pop(source_lang, None)
+            source_transcript_raw = cues_to_text(source_cues) if source_cues else None
+            if youtube_target:
+                target_cues = transcripts.get(target_lang)
+                if target_cues:
+                    youtube_translation = cues_to_text(target_cues)
+                else:
+                    self._mark_missing_track(video_id, target_lang)
+
+            # Every extra track, the target included, is cached as its own
+            # transcript so a later request for that source skips yt-dlp
+            for lang, cues in transcripts.items():
+                self._save_prefetched_transcript(
+                    video_id, title, url, lang, cues, available_subs, video_info
+                )
+            if youtube_translation:
+                youtube_translation_processed = self.load_processed_transcript(
+                    video_id, target_lang, youtube_translation
+                )
+
+            if not source_transcript_raw:
+                self._reject_missing_language(
+                    video_id,
+                    source_lang,
+                    f"Could not fetch transcript for language '{source_lang}'",
+                )
+
+            logger.info(
+                "Fetched source transcript: %d chars", len(source_transcript_raw)
+            )
+
+        # Process transcript if requested, using cue timings where available
         source_transcript_processed = None
-        if source_transcript_raw and merge_lines:
-            source_transcript_processed = self.prepare_text_for_translation(
-                source_transcript_raw
+        if merge_lines and source_cues:
+            source_transcript_processed = self.prepare_cues_for_translation(source_cues)
+        elif merge_lines:
+            source_transcript_processed = self.load_processed_transcript(
+                video_id, source_lang, source_transcript_raw
             )
 
-        # Handle target language translation — always via LibreTranslate
+        # Handle target language translation — YouTube track or LibreTranslate
         target_transcript_raw = None
         target_transcript_processed = None
         translation_provider = None
         translation_error = None
 
-        if target_lang and target_lang != source_lang:
+        if wants_translation and youtube_translation:
+            logger.info("Using YouTube caption track for %s", target_lang)
+            target_transcript_raw = youtube_translation
+            target_transcript_processed = (
+                youtube_translation_processed if merge_lines else youtube_translation
+            )
+            translation_provider = "youtube"
+        elif wants_translation:
             logger.info(
                 "Translating from %s to %s via LibreTranslate", source_lang, target_lang
             )
@@ -307,11 +574,15 @@ class YouTubeTranscriptService:
             text_to_translate = source_transcript_processed or source_transcript_raw
 
             try:
-                translation_result = await self.translation_service.translate(
-                    text=text_to_translate,
-                    source_lang=source_lang,
-                    target_lang=target_lang,
-                    provider="libretranslate",
+                # Cancelling on the deadline also drops any chunks not yet sent
+                translation_result = await asyncio.wait_for(
+                    self.translation_service.translate(
+                        text=text_to_translate,
+                        source_lang=source_lang,
+                        target_lang=target_lang,
+                        provider="libretranslate",
+                    ),
+                    settings.TRANSLATION_TIMEOUT,
                 )
 
                 target_transcript_raw = translation_result["translatedText"]
@@ -323,6 +594,11 @@ class YouTubeTranscriptService:
                     len(target_transcript_raw),
                 )
 
+            except asyncio.TimeoutError:
+                translation_error = (
+                    f"Translation timed out after {settings.TRANSLATION_TIMEOUT}s"
+                )
+                logger.error("Translation to %s timed out", target_lang)
             except Exception as e:
                 translation_error = f"Translation failed: {str(e)}"
                 logger.error("Failed to translate to %s: %s", target_lang, e)
@@ -363,30 +639,165 @@ class YouTubeTranscriptService:
             "cached": False,
             "entry_id": entry_id,
             "translation_error": translation_error,
+            "translation_provider": translation_provider,
             "folder_path": video_id,
         }
 
-        # Save files to entry subfolder
-        entry_folder = self.get_entry_folder(video_id)
+        # Queue files for the entry subfolder; they are written in the background
+        entry_folder = self.transcript_dir / video_id
 
-        # Write source transcript
+        # Write source transcript (already on disk when it came from cache)
         source_file = entry_folder / f"transcript_{source_lang}.txt"
-        source_file.write_text(source_transcript_raw)
-        logger.info("Saved source transcript to %s", source_file)
+        if not source_cached or not writer.exists(source_file):
+            self._write_text_file(source_file, source_transcript_raw)
+            logger.info("Queued source transcript for %s", source_file)
+        if source_cues:
+            # Timed cues let clients sync the text to video playback
+            writer.write_text(
+                entry_folder / f"cues_{source_lang}.json", dump_cues(source_cues)
+            )
+            if source_transcript_processed:
+                self.save_processed_transcript(
+                    video_id, source_lang, source_transcript_processed
+                )
 
-        # Write translation if available
+        # Write translation if available; cache hits serve its paragraph form
         if target_transcript_raw:
             translation_file = entry_folder / f"translation_{target_lang}.txt"
-            translation_file.write_text(target_transcript_raw)
-            logger.info("Saved translation to %s", translation_file)
+            self._write_text_file(translation_file, target_transcript_raw)
+            logger.info("Queued translation for %s", translation_file)
+            if merge_lines:
+                self.save_processed_transcript(
+                    video_id,
+                    target_lang,
+                    target_transcript_processed,
+                    source_lang=source_lang,
+                )
 
         # Write metadata
-        meta_file = entry_folder / "meta.json"
-        meta_file.write_text(json.dumps(result, indent=2, ensure_ascii=False))
-        logger.info("Saved metadata to %s", meta_file)
+        # meta.json references the texts by hash instead of embedding them
+        meta = {k: v for k, v in result.items() if k not in META_TEXT_FIELDS}
+        for field in META_TEXT_FIELDS:
+            text = result[field]
+            meta[f"{field}_hash"] = self.blob_store.put(text) if text else None
+        writer.write_json(entry_folder / "meta.json", meta)
 
         return result
 
+    def _youtube_track_available(
+        self, video_id: str, language: str, available_subs: List[str]
+    ) -> bool:
+        """Whether YouTube may serve a caption track in language"""
+        return (not available_subs or language in available_subs) and not (
+            self.missing_subtitles.get(
+                f"{video_id}:{language}", settings.NEGATIVE_CACHE_TTL
+            )
+        )
+
+    def _mark_missing_track(self, video_id: str, language: str):
+        self.missing_subtitles.set(
+            f"{video_id}:{language}",
+            f"Could not fetch transcript for language '{language}'",
+        )
+
+    def _reject_missing_language(self, video_id: str, language: str, reason: str):
+        """Record a missing subtitle track in the negative cache and raise"""
+        self.missing_subtitles.set(f"{video_id}:{language}", reason)
+        raise ValueError(reason)
+
+    def _prefetch_languages(
+        self,
+        video_id: str,
+        source_lang: str,
+        metadata: Dict,
+        prefetch_langs: Optional[List[str]] = None,
+        prefetch_all_manual: Optional[bool] = None,
+    ) -> List[str]:
+        """Pick extra subtitle languages to download alongside the source"""
+        if prefetch_langs is None:
+            prefetch_langs = settings.SUBTITLE_PREFETCH_LANGS
+        if prefetch_all_manual is None:
+            prefetch_all_manual = settings.SUBTITLE_PREFETCH_ALL_MANUAL
+
+        candidates = list(prefetch_langs)
+        if prefetch_all_manual:
+            candidates.extend(metadata.get("manual_languages", []))
+
+        available = metadata.get("available_languages")
+        extra_langs = []
+        for lang in dict.fromkeys(candidates):
+            if lang == source_lang or (available and lang not in available):
+                continue
+            # Skip languages that were already ingested for this video
+            if self.history_service.find_youtube_entry(video_id, lang):
+                continue
+            extra_langs.append(lang)
+
+        return extra_langs
+
+    def _save_prefetched_transcript(
+        self,
+        video_id: str,
+        title: str,
+        url: str,
+        lang: str,
+        cues: List[Cue],
+        available_languages: List[str],
+        video_info: Dict,
+    ):
+        """Store an additional source-language transcript and register it in history"""
+        entry_folder = self.transcript_dir / video_id
+        text = cues_to_text(cues)
+        source_file = entry_folder / f"transcript_{lang}.txt"
+        self._write_text_file(source_file, text)
+        writer.write_text(entry_folder / f"cues_{lang}.json", dump_cues(cues))
+        self.save_processed_transcript(
+            video_id, lang, self.prepare_cues_for_translation(cues)
+        )
+        self.history_service.add_transcript_entry(
+            video_id=video_id,
+            title=title,
+            url=url,
+            original_text=text,
+            source_lang=lang,
+            available_languages=available_languages,
+            video_info=video_info,
+            folder_path=video_id,
+        )
+        logger.info("Saved prefetched %s transcript to %s", lang, source_file)
+
+    async def stored_file(
+        self, video_id: str, lang: str, translation: bool = False
+    ) -> Optional[Tuple[Path, str]]:
+        """Path and SHA-256 of a stored transcript or translation file.
+
+        Waits for a queued write of the file to reach disk. Hashes are
+        remembered per (inode, mtime, size), so each version is read once.
+        """
+        if not VIDEO_ID_RE.fullmatch(video_id) or not LANG_RE.fullmatch(lang):
+            raise ValueError("Invalid video ID or language")
+
+        prefix = "translation" if translation else "transcript"
+        path = self.transcript_dir / video_id / f"{prefix}_{lang}.txt"
+        await asyncio.to_thread(writer.wait, path, 30)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        cached = self._file_hashes.get(path)
+        if cached and cached[0] == version:
+            return path, cached[1]
+
+        def sha256() -> str:
+            with open(path, "rb") as f:
+                return hashlib.file_digest(f, "sha256").hexdigest()
+
+        digest = await asyncio.to_thread(sha256)
+        self._file_hashes[path] = (version, digest)
+        return path, digest
+
     def sanitize_filename(self, name: str) -> str:
         """Make a string safe for use as filename"""
         # Remove or replace invalid characters
@@ -401,26 +812,28 @@ class YouTubeTranscriptService:
         return folder
 
     def save_translation_to_folder(
-        self, video_id: str, target_lang: str, translated_text: str
+        self, video_id: str, source_lang: str, target_lang: str, translated_text: str
     ):
-        """Write a translation file to an existing entry's folder and update meta.json"""
-        folder = self.get_entry_folder(video_id)
+        """Queue a translation file for an entry's folder and update meta.json"""
+        folder = self.transcript_dir / video_id
 
         # Write translation file
         translation_file = folder / f"translation_{target_lang}.txt"
-        translation_file.write_text(translated_text)
-        logger.info("Saved translation to %s", translation_file)
+        digest = self._write_text_file(translation_file, translated_text)
+        logger.info("Queued translation for %s", translation_file)
+        # Translations of merged text are already in paragraph form
+        self.save_processed_transcript(
+            video_id, target_lang, translated_text, source_lang=source_lang
+        )
 
-        # Update meta.json if it exists
-        meta_file = folder / "meta.json"
-        if meta_file.exists():
-            try:
-                meta = json.loads(meta_file.read_text())
-                meta["target_transcript_raw"] = translated_text
-                meta["target_transcript_processed"] = translated_text
-                meta["target_lang"] = target_lang
-                meta["translation_error"] = None
-                meta_file.write_text(json.dumps(meta, indent=2, ensure_ascii=False))
-                logger.info("Updated meta.json in %s", folder)
-            except Exception as e:
-                logger.warning("Failed to update meta.json: %s", e)
+        def update_meta(meta: Dict) -> Dict:
+            meta.pop("target_transcript_raw", None)
+            meta.pop("target_transcript_processed", None)
+            meta["target_transcript_raw_hash"] = digest
+            meta["target_transcript_processed_hash"] = digest
+            meta["target_lang"] = target_lang
+            meta["translation_error"] = None
+            return meta
+
+        # Applied in the background, and only if meta.json exists
+        writer.update_json(folder / "meta.json", update_meta)
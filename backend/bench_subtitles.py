@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared subtitle parser against the previous line loop.
+Run with: python bench_subtitles.py [--hours 3] [--repeat 5]
+"""
+
+import argparse
+import re
+import time
+
+from app.services.subtitles import (
+    Cue,
+    cues_to_text,
+    dedupe_cues,
+    iter_chunks,
+    iter_text_segments,
+    parse_timed_text,
+)
+
+# Checked before timing: literal "<" in cue text must not swallow the
+# timing lines of the cues after it
+SAMPLES = [
+    (
+        "1\n00:00:01,000 --> 00:00:02,000\nif x < 5 then\n\n"
+        "2\n00:00:03,000 --> 00:00:04,000\nok\n\n"
+        "3\n00:00:05,000 --> 00:00:06,000\n<i>done</i>\n",
+        [Cue(1.0, 2.0, "if x < 5 then"), Cue(3.0, 4.0, "ok"), Cue(5.0, 6.0, "done")],
+    ),
+    (
+        "WEBVTT\n\n00:01.000 --> 00:02.000\nI <3 you\n\n"
+        "01:00:03.000 --> 01:00:04.500 align:start\n<c>a</c> &amp; b\n \n",
+        [Cue(1.0, 2.0, "I <3 you"), Cue(3603.0, 3604.5, "a & b")],
+    ),
+]
+
+# Rolling auto-captions where a line is really said twice in a row: only
+# the carried-over copies (no word timings) may be dropped
+DEDUPE_SAMPLES = [
+    (
+        "WEBVTT\n\n"
+        "00:00:00.000 --> 00:00:02.000 align:start position:0%\n"
+        "yeah<00:00:00.500><c> okay</c>\n\n"
+        "00:00:02.000 --> 00:00:02.010 align:start position:0%\n"
+        "yeah okay\n \n\n"
+        "00:00:02.010 --> 00:00:04.000 align:start position:0%\n"
+        "yeah okay\nyeah<00:00:02.500><c> okay</c>\n\n"
+        "00:00:04.000 --> 00:00:04.010 align:start position:0%\n"
+        "yeah okay\n \n\n"
+        "00:00:04.010 --> 00:00:06.000 align:start position:0%\n"
+        "yeah okay\nso<00:00:04.500><c> anyway</c>\n",
+        "yeah okay\nyeah okay\nso anyway",
+    ),
+]
+
+
+def legacy_clean(vtt_content):
+    """The per-line loop formerly used by clean_vtt and clean_subtitle"""
+    lines = vtt_content.split("\n")
+    clean_lines = []
+    seen = set()
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line == "WEBVTT":
+            continue
+        if line.startswith("Kind:") or line.startswith("Language:"):
+            continue
+        if "-->" in line:
+            continue
+        if re.match(r"^\d+$", line):
+            continue
+        if re.match(r"^\d{2}:\d{2}", line):
+            continue
+        line = re.sub(r"<[^>]+>", "", line)
+
+        if line and line not in seen:
+            seen.add(line)
+            clean_lines.append(line)
+
+    return "\n".join(clean_lines)
+
+
+def timestamp(seconds, sep="."):
+    h, rest = divmod(seconds, 3600)
+    m, s = divmod(rest, 60)
+    return f"{int(h):02d}:{int(m):02d}:{s:06.3f}".replace(".", sep)
+
+
+def make_youtube_vtt(hours):
+    """Rolling two-line auto-captions as YouTube serves them"""
+    out = ["WEBVTT", "Kind: captions", "Language: en", ""]
+    t = 0.0
+    previous = ""
+    i = 0
+    while t < hours * 3600:
+        words = [f"word{i}", f"token{i % 97}", "and", f"more{i % 13}"]
+        current = " ".join(words)
+        timed = words[0] + "".join(
+            f"<{timestamp(t + 0.3 * (n + 1))}><c> {w}</c>"
+            for n, w in enumerate(words[1:])
+        )
+        out.append(f"{timestamp(t)} --> {timestamp(t + 2)} align:start position:0%")
+        if previous:
+            out.append(previous)
+        out.extend([timed, ""])
+        out.append(f"{timestamp(t + 2)} --> {timestamp(t + 2.01)} align:start position:0%")
+        out.extend([current, " ", ""])
+        previous = current
+        t += 2.01
+        i += 1
+    return "\n".join(out)
+
+
+def make_srt(hours):
+    out = []
+    t = 0.0
+    i = 1
+    while t < hours * 3600:
+        out.append(str(i))
+        out.append(f"{timestamp(t, ',')} --> {timestamp(t + 2.5, ',')}")
+        out.append(f"<i>Line {i}</i> of the subtitle file")
+        out.append(f"second line {i % 50}")
+        out.append("")
+        t += 2.5
+        i += 1
+    return "\n".join(out)
+
+
+# Documents on a single line (no paragraph breaks at all) must still be
+# chunked: sentences, then plain words, then one unbroken token
+CHUNK_SAMPLES = [
+    "Short sentence number one. " * 80,
+    "an unpunctuated stream of words " * 60,
+    "x" * 1300,
+]
+
+
+def check():
+    for content, expected in SAMPLES:
+        cues = parse_timed_text(content)
+        assert cues == expected, f"parsed {cues}, expected {expected}"
+    for content, expected in DEDUPE_SAMPLES:
+        text = cues_to_text(dedupe_cues(parse_timed_text(content)))
+        assert text == expected, f"deduped {text!r}, expected {expected!r}"
+    for line in CHUNK_SAMPLES:
+        chunks = list(iter_chunks(iter_text_segments([line], 200, 1000), 500))
+        assert len(chunks) > 1 and all(len(c) <= 500 for c in chunks), [
+            len(c) for c in chunks
+        ]
+        assert "".join(chunks).replace(" ", "") == line.replace(" ", "")
+
+
+def bench(func, content, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    check()
+
+    samples = {
+        "youtube vtt": make_youtube_vtt(args.hours),
+        "srt": make_srt(args.hours),
+    }
+
+    for name, content in samples.items():
+        line_count = content.count("\n") + 1
+        legacy = bench(legacy_clean, content, args.repeat)
+        parsed = bench(parse_timed_text, content, args.repeat)
+        cleaned = bench(
+            lambda c: cues_to_text(dedupe_cues(parse_timed_text(c))), content, args.repeat
+        )
+        print(f"{name}: {line_count} lines ({args.hours:g}h)")
+        print(f"  legacy loop           {line_count / legacy:>12,.0f} lines/sec")
+        print(f"  cue parser            {line_count / parsed:>12,.0f} lines/sec")
+        print(f"  cue parser + dedupe   {line_count / cleaned:>12,.0f} lines/sec")
+
+
+if __name__ == "__main__":
+    main()
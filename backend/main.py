@@ -4,6 +4,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from contextlib import asynccontextmanager
+import asyncio
 import json
 import os
 import logging
@@ -11,6 +12,9 @@ from pathlib import Path
 
 from app.api import translate, history, youtube, settings as settings_api
 from app.config import settings
+from app.middleware import CompressionMiddleware
+from app.services.extraction import extractor
+from app.services.persistence import writer
 
 # Configure logging
 logging.basicConfig(
@@ -48,6 +52,10 @@ async def lifespan(app: FastAPI):
     )
     yield
     logger.info("Shutting down YTT")
+    extractor.shutdown()
+    # Flush transcript files queued by the last requests
+    if not await asyncio.to_thread(writer.drain, 30):
+        logger.warning("Shutdown before all transcript files were written")
 
 
 app = FastAPI(
@@ -67,6 +75,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
 app.include_router(translate.router, prefix="/api")
 app.include_router(history.router, prefix="/api")
 app.include_router(youtube.router, prefix="/api")
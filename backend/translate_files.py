@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Translate a directory or glob of files without the web server.
+Run with: python translate_files.py transcripts/ "notes/*.md" --target de
+          [--source auto] [--workers 4] [--output translated] [--register]
+
+Text files, PDFs and documents are written as <name>.<target>.txt (.md stays
+.md); SRT/VTT files are translated cue by cue into <name>.<target>.srt/.vtt.
+Finished files are recorded in <output>/.progress.json and skipped on the
+next run unless they changed, so an interrupted run can simply be restarted.
+Translations are cached under data/translation_cache and shared between
+workers and runs.
+"""
+
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import UploadFile
+
+from app.services.cache import TranslationCache
+from app.services.extraction import extractor
+from app.services.file_handler import FileHandler
+from app.services.history import HistoryService
+from app.services.persistence import writer
+from app.services.subtitles import Cue, cues_to_text, dump_subtitles
+from app.services.translator import TranslationService
+
+SUBTITLE_FORMATS = (".srt", ".vtt")
+KEPT_SUFFIXES = (".txt", ".md") + SUBTITLE_FORMATS
+
+
+def collect_files(patterns: List[str], supported: List[str]) -> List[Tuple[Path, Path]]:
+    """(file, output path relative to the output directory) for every match"""
+    files = {}
+    for pattern in patterns:
+        root = Path(pattern)
+        if root.is_dir():
+            for path in sorted(root.rglob("*")):
+                if path.is_file() and path.suffix.lower() in supported:
+                    files[path] = path.relative_to(root)
+        else:
+            for name in sorted(glob.glob(pattern, recursive=True)):
+                path = Path(name)
+                if path.is_file() and path.suffix.lower() in supported:
+                    files[path] = Path(path.name)
+    return list(files.items())
+
+
+def output_name(relative: Path, target_lang: str) -> Path:
+    suffix = relative.suffix.lower()
+    suffix = suffix if suffix in KEPT_SUFFIXES else ".txt"
+    return relative.with_name(f"{relative.stem}.{target_lang}{suffix}")
+
+
+def file_hash(path: Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def load_progress(path: Path) -> Dict[str, Dict]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+async def translate_file(
+    path: Path,
+    args: argparse.Namespace,
+    file_handler: FileHandler,
+    translator: TranslationService,
+) -> Tuple[str, str, str]:
+    """Return (original text, translated text, output file content)"""
+    with open(path, "rb") as f:
+        upload = UploadFile(f, filename=path.name, size=path.stat().st_size)
+
+        if path.suffix.lower() in SUBTITLE_FORMATS:
+            cues = await file_handler.extract_cues(upload)
+            translated = await translator.translate_batch(
+                [" ".join(cue.text.split("\n")) for cue in cues],
+                args.source,
+                args.target,
+                args.provider,
+            )
+            translated_cues = [
+                Cue(cue.start, cue.end, text) for cue, text in zip(cues, translated)
+            ]
+            return (
+                cues_to_text(cues),
+                cues_to_text(translated_cues),
+                dump_subtitles(translated_cues, path.suffix.lower().lstrip(".")),
+            )
+
+        text, _ = await file_handler.extract_text(upload)
+
+    result = await translator.translate(
+        translator.prepare_text_for_translation(text),
+        args.source,
+        args.target,
+        args.provider,
+    )
+    return text, result["translatedText"], result["translatedText"]
+
+
+async def run(args: argparse.Namespace) -> int:
+    file_handler = FileHandler()
+    cache = None if args.no_cache else TranslationCache(args.cache_dir)
+    translator = TranslationService(cache=cache)
+    history_service = HistoryService() if args.register else None
+
+    output_dir = Path(args.output)
+    progress_file = output_dir / ".progress.json"
+    progress = load_progress(progress_file)
+
+    files = collect_files(args.paths, file_handler.supported_formats)
+    if not files:
+        print("No supported files found")
+        return 1
+
+    queue: "asyncio.Queue[Tuple[int, Path, Path]]" = asyncio.Queue()
+    for i, (path, relative) in enumerate(files, 1):
+        queue.put_nowait((i, path, relative))
+    counts = {"done": 0, "skipped": 0, "failed": 0}
+
+    async def worker():
+        while not queue.empty():
+            i, path, relative = queue.get_nowait()
+            prefix = f"[{i}/{len(files)}] {path}"
+            output = output_dir / output_name(relative, args.target)
+            digest = await asyncio.to_thread(file_hash, path)
+
+            done: Optional[Dict] = progress.get(str(path))
+            if (
+                not args.force
+                and done
+                and done["sha256"] == digest
+                and done["target_lang"] == args.target
+                and Path(done["output"]).exists()
+            ):
+                counts["skipped"] += 1
+                print(f"{prefix}: unchanged, skipped")
+                continue
+
+            start = time.time()
+            try:
+                original, translated, content = await translate_file(
+                    path, args, file_handler, translator
+                )
+            except Exception as e:
+                counts["failed"] += 1
+                print(f"{prefix}: failed: {e}", file=sys.stderr)
+                continue
+
+            writer.write_text(output, content)
+            entry_id = None
+            if history_service:
+                entry_id = history_service.add_translation_entry(
+                    original_text=original,
+                    translated_text=translated,
+                    source_lang=args.source,
+                    target_lang=args.target,
+                    provider=args.provider,
+                    title=f"File: {path.name}",
+                )
+
+            progress[str(path)] = {
+                "sha256": digest,
+                "target_lang": args.target,
+                "output": str(output),
+                "entry_id": entry_id,
+            }
+            writer.write_json(progress_file, dict(progress))
+            counts["done"] += 1
+            print(f"{prefix} -> {output} ({time.time() - start:.1f}s)")
+
+    await asyncio.gather(*(worker() for _ in range(max(args.workers, 1))))
+
+    print(
+        f"{counts['done']} translated, {counts['skipped']} skipped, "
+        f"{counts['failed']} failed"
+    )
+    return 1 if counts["failed"] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("paths", nargs="+", help="Directories, files or glob patterns")
+    parser.add_argument("--target", required=True, help="Target language code")
+    parser.add_argument("--source", default="auto", help="Source language code")
+    parser.add_argument("--provider", default="libretranslate")
+    parser.add_argument("--output", default="translated", help="Output directory")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--register", action="store_true", help="Add each translation to history"
+    )
+    parser.add_argument("--cache-dir", type=Path, default=None)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument(
+        "--force", action="store_true", help="Translate files already done"
+    )
+    args = parser.parse_args()
+
+    try:
+        status = asyncio.run(run(args))
+    finally:
+        extractor.shutdown()
+        writer.drain()
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -30,6 +30,10 @@ export interface YouTubeRequest {
   target_lang?: string;
   use_cookies?: string;
   merge_lines?: boolean;
+  prefetch_langs?: string[];  // Extra source languages cached in the same fetch
+  prefetch_all_manual?: boolean;  // Also cache every manual subtitle track
+  prefer_youtube_translation?: boolean;  // Use YouTube's translated captions first
+  fields?: string[];  // Response keys to return (default: all)
 }
 
 export interface YouTubeResponse {
@@ -53,6 +57,7 @@ export interface YouTubeResponse {
   entry_id?: string;  // ID for history entry
   cached?: boolean;  // Whether this came from cache
   translation_error?: string;  // Error message if translation failed
+  translation_provider?: string;  // "youtube" or "libretranslate"
 }
 
 // Helper for API calls
@@ -139,10 +144,29 @@ export const youtubeAPI = {
 
   extractVideoId: async (url: string) => {
     return fetchAPI(`/youtube/extract-id?url=${encodeURIComponent(url)}`);
+  },
+
+  startBatch: async (url: string, sourceLang: string, targetLang?: string, maxVideos?: number) => {
+    return fetchAPI('/youtube/batch', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ url, source_lang: sourceLang, target_lang: targetLang, max_videos: maxVideos })
+    });
+  },
+
+  getBatch: async (jobId: string) => {
+    return fetchAPI(`/youtube/batch/${jobId}`);
   }
 };
 
 // History endpoints
+export interface HistoryChanges {
+  revision: number;
+  reset: boolean;  // Too far behind (or history cleared): reload the list
+  entries: any[];  // Added or changed entries, newest first
+  deleted: string[];  // Ids of removed entries
+}
+
 export const historyAPI = {
   getHistory: async (limit = 20, offset = 0) => {
     return fetchAPI(`/history?limit=${limit}&offset=${offset}`);
@@ -154,6 +178,29 @@ export const historyAPI = {
 
   deleteTranslation: async (id: string) => {
     return fetchAPI(`/history/${id}`, { method: 'DELETE' });
+  },
+
+  // One record per source text, with every translation attached
+  getRecords: async (limit = 20, offset = 0) => {
+    return fetchAPI(`/history/records?limit=${limit}&offset=${offset}`);
+  },
+
+  getRecord: async (id: string) => {
+    return fetchAPI(`/history/records/${id}`);
+  },
+
+  // Entries added, changed or deleted since a history revision
+  getChanges: async (since: number): Promise<HistoryChanges> => {
+    return fetchAPI(`/history/changes?since=${since}`);
+  },
+
+  // Live changes from now on; close() the returned EventSource when done
+  streamChanges: (onChanges: (changes: HistoryChanges) => void) => {
+    const source = new EventSource(`${API_BASE}/history/stream`);
+    source.addEventListener('changes', (event) => {
+      onChanges(JSON.parse((event as MessageEvent).data));
+    });
+    return source;
   }
 };
 